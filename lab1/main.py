@@ -1,15 +1,30 @@
+import csv
 import json
-from typing import Any
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from math import isqrt
+from operator import add, mul
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy przyspiesza tylko operacje wsadowe Matrix
+    np = None
 
 
 class ModelAI:
 
     liczba_modeli: int = 0
+    _licznik_lock = threading.Lock()
 
     def __init__(self, nazwa_modelu: str, wersja: Any):
         self.nazwa_modelu = nazwa_modelu
         self.wersja = wersja
-        ModelAI.liczba_modeli += 1
+        # += na atrybucie klasy nie jest atomowe między wątkami
+        with ModelAI._licznik_lock:
+            ModelAI.liczba_modeli += 1
 
     @classmethod
     def nowy_model(cls, nazwa_modelu: str = "unnamed", wersja: Any = 1.0) -> "ModelAI":
@@ -32,35 +47,444 @@ class ModelAI:
         return f"ModelAI({self.nazwa_modelu!r}, {self.wersja!r})"
 
 
+def _version_key(version: str) -> Tuple:
+    # "1.10" > "1.9"; części nieliczbowe porównywane jako tekst
+    parts = version.split(".")
+    return tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in parts)
+
+
+class _Manifest:
+
+    __slots__ = ("path", "name", "version", "stamp", "model")
+
+    def __init__(self, path: str, name: Optional[str], version: Optional[str]):
+        self.path = path
+        self.name = name
+        self.version = version
+        self.stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, rozmiar)
+        self.model: Optional[ModelAI] = None
+
+
+class ModelRegistry:
+    """Katalog manifestów modeli (``*.json`` z polami ``name`` i ``version``).
+
+    ``scan`` czyta tylko listę plików (``os.scandir``), bez ich otwierania.
+    Pliki nazwane ``nazwa@wersja.json`` trafiają od razu do indeksu
+    nazwa -> wersja -> manifest; pozostałe są parsowane raz, przy pierwszym
+    wyszukiwaniu, i dopisywane do indeksu. Wynik parsowania jest zapamiętywany
+    i unieważniany, gdy zmieni się czas modyfikacji lub rozmiar pliku.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._manifests: Dict[str, _Manifest] = {}
+        self._index: Dict[str, Dict[str, _Manifest]] = {}
+        self._unparsed: List[_Manifest] = []
+        self.scan()
+
+    def scan(self) -> None:
+        manifests: Dict[str, _Manifest] = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                stem = entry.name[: -len(".json")]
+                name, sep, version = stem.partition("@")
+                known = self._manifests.get(entry.name)
+                if known is not None and known.path == entry.path:
+                    manifests[entry.name] = known  # zachowaj sparsowany wynik
+                else:
+                    manifests[entry.name] = _Manifest(
+                        entry.path, name if sep else None, version if sep else None
+                    )
+        index: Dict[str, Dict[str, _Manifest]] = {}
+        unparsed = []
+        for manifest in manifests.values():
+            if manifest.name is None:
+                unparsed.append(manifest)
+            else:
+                index.setdefault(manifest.name, {})[manifest.version] = manifest
+        with self._lock:
+            self._manifests = manifests
+            self._index = index
+            self._unparsed = unparsed
+
+    def __len__(self) -> int:
+        return len(self._manifests)
+
+    def _unindex(self, manifest: _Manifest) -> None:
+        by_version = self._index.get(manifest.name)
+        if by_version is not None and by_version.get(manifest.version) is manifest:
+            del by_version[manifest.version]
+            if not by_version:
+                del self._index[manifest.name]
+
+    def _reindex(self, manifest: _Manifest, name: str, version: str) -> None:
+        # Przenosi manifest pod nazwę/wersję odczytaną z pliku
+        self._unindex(manifest)
+        manifest.name = name
+        manifest.version = version
+        self._index.setdefault(name, {})[version] = manifest
+
+    def _forget(self, manifest: _Manifest) -> None:
+        with self._lock:
+            filename = os.path.basename(manifest.path)
+            if self._manifests.get(filename) is manifest:
+                del self._manifests[filename]
+            self._unindex(manifest)
+
+    def _load(self, manifest: _Manifest) -> ModelAI:
+        """Model z pliku manifestu; usunięty plik wypada z rejestru.
+
+        Rzuca ``FileNotFoundError``, gdy pliku już nie ma.
+        """
+        try:
+            st = os.stat(manifest.path)
+        except FileNotFoundError:
+            self._forget(manifest)
+            raise
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if manifest.model is None or manifest.stamp != stamp:
+                try:
+                    with open(manifest.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except FileNotFoundError:
+                    self._forget(manifest)
+                    raise
+                manifest.model = ModelAI(data["name"], data["version"])
+                name, version = data["name"], str(data["version"])
+                if (name, version) != (manifest.name, manifest.version):
+                    self._reindex(manifest, name, version)
+                manifest.stamp = stamp
+            return manifest.model
+
+    def _parse_unnamed(self) -> None:
+        # Pliki bez nazwy w nazwie pliku trzeba przeczytać, by je zaindeksować
+        with self._lock:
+            unparsed, self._unparsed = self._unparsed, []
+            for manifest in unparsed:
+                try:
+                    self._load(manifest)
+                except FileNotFoundError:
+                    pass  # usunięty od czasu scan - _load już go zapomniał
+
+    def get(self, name: str, version: Any = None) -> ModelAI:
+        """Model o danej nazwie i wersji; bez wersji - najnowszy."""
+        self._parse_unnamed()
+        with self._lock:
+            by_version = self._index.get(name, {})
+            if version is None:
+                best = max(by_version, key=_version_key, default=None)
+            else:
+                best = str(version) if str(version) in by_version else None
+            if best is None:
+                raise KeyError(f"Brak modelu {name!r} w wersji {version!r}")
+            try:
+                model = self._load(by_version[best])
+            except FileNotFoundError:
+                # Plik usunięty od czasu scan - szukaj wśród pozostałych
+                return self.get(name, version)
+        if model.nazwa_modelu != name or (
+            version is not None and str(model.wersja) != str(version)
+        ):
+            # Plik zmienił zawartość od czasu indeksowania - szukaj ponownie
+            return self.get(name, version)
+        return model
+
+    def versions(self, name: str) -> List[str]:
+        self._parse_unnamed()
+        with self._lock:
+            versions = [v for v in self._index.get(name, {}) if v]
+        return sorted(versions, key=_version_key)
+
+    def __iter__(self) -> Iterator[ModelAI]:
+        for manifest in list(self._manifests.values()):
+            try:
+                model = self._load(manifest)
+            except FileNotFoundError:
+                continue
+            yield model
+
+
+# Do 4x4 elementy trzymane są w liście: odczyt/zapis elementu array pakuje
+# i rozpakowuje liczbę, co przy 2x2 kosztuje więcej niż samo mnożenie
+_SMALL_SIZE = 16
+
+
+def _pack(values: Iterable[Any]):
+    # Ciągły bufor, gdy nie zmienia to wyników; w innych przypadkach zwykła lista
+    values = list(values)
+    if len(values) <= _SMALL_SIZE:
+        return values
+    kinds = {type(v) for v in values}
+    if kinds == {float}:
+        return array("d", values)
+    if kinds == {int}:
+        try:
+            return array("q", values)
+        except OverflowError:  # liczby spoza int64 - zostają dokładne
+            return values
+    return values
+
+
+def _matmul(x, y, n: int) -> list:
+    if n == 2:
+        a, b, c, d = x
+        e, f, g, h = y
+        return [a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h]
+    rows = [x[i : i + n] for i in range(0, n * n, n)]
+    cols = [y[j::n] for j in range(n)]
+    return [sum(map(mul, row, col)) for row in rows for col in cols]
+
+
+def _fill(buffer, values: List[Any]):
+    # Wpisuje wyniki w istniejący bufor (bez obiektów pośrednich); nowy bufor
+    # powstaje tylko, gdy zmienia się typ elementów (int -> float, spoza int64)
+    if type(buffer) is list:
+        buffer[:] = values
+        return buffer
+    try:
+        for i, v in enumerate(values):
+            buffer[i] = v
+    except (TypeError, OverflowError):
+        return _pack(values)
+    return buffer
+
+
+_new = object.__new__
+
+
+def _element(index: int) -> property:
+    # Dotychczasowe pola a, b, c, d macierzy 2x2 (zawsze bufor-lista)
+    def get(self: "Matrix"):
+        if self.n != 2:
+            raise AttributeError("Pola a, b, c, d istnieją tylko dla macierzy 2x2")
+        return self._data[index]
+
+    def set(self: "Matrix", value: Any) -> None:
+        get(self)
+        self._data[index] = value
+
+    return property(get, set)
+
+
 class Matrix:
+    """Macierz kwadratowa NxN przechowywana wierszami w płaskim buforze.
 
-    def __init__(self, a: float, b: float, c: float, d: float):
-        self.a, self.b, self.c, self.d = a, b, c, d
+    ``Matrix(a, b, c, d)`` tworzy macierz 2x2 jak dotąd; ogólnie liczba
+    argumentów musi być kwadratem (9 wartości -> 3x3). Macierze do 4x4 trzymają
+    elementy w liście, większe: same ``int`` w ``array('q')``, same ``float``
+    w ``array('d')``, a pozostałe (mieszane, spoza int64, complex, ...) w
+    liście, więc wyniki i ``__str__`` są takie same jak dla zwykłych liczb.
+    Operacje w miejscu (``+=``, ``*=``) wpisują wynik w istniejący bufor.
+    """
+
+    __slots__ = ("n", "_data")
+
+    a = _element(0)
+    b = _element(1)
+    c = _element(2)
+    d = _element(3)
+
+    def __init__(self, *values: Any):
+        n = isqrt(len(values))
+        if n == 0 or n * n != len(values):
+            raise ValueError("Liczba elementów musi być kwadratem liczby naturalnej")
+        self.n = n
+        self._data = _pack(values)
+
+    @classmethod
+    def _from_flat(cls, n: int, values: Iterable[Any]) -> "Matrix":
+        m = cls.__new__(cls)
+        m.n = n
+        # Gotowy bufor array przejmowany jest bez kopiowania
+        m._data = values if isinstance(values, array) else _pack(values)
+        return m
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[Any]]) -> "Matrix":
+        if any(len(row) != len(rows) for row in rows):
+            raise ValueError("Macierz musi być kwadratowa")
+        return cls(*(v for row in rows for v in row))
+
+    @classmethod
+    def identity(cls, n: int = 2) -> "Matrix":
+        return cls._from_flat(n, (int(i % (n + 1) == 0) for i in range(n * n)))
+
+    def __getitem__(self, ij: Tuple[int, int]) -> Any:
+        i, j = ij
+        return self._data[i * self.n + j]
+
+    def tolist(self) -> List[List[Any]]:
+        n = self.n
+        return [list(self._data[i : i + n]) for i in range(0, n * n, n)]
+
+    def _check(self, other: object) -> bool:
+        if not isinstance(other, Matrix):
+            return False
+        if other.n != self.n:
+            raise ValueError(
+                f"Niezgodne wymiary: {self.n}x{self.n} i {other.n}x{other.n}"
+            )
+        return True
+
+    def _product(self, other: "Matrix") -> List[Any]:
+        if other.n != self.n:
+            self._check(other)
+        return _matmul(self._data, other._data, self.n)
+
+    def _with(self, values: List[Any]) -> "Matrix":
+        # Nowa macierz z bufora typu self; ``values`` to świeża lista - bez kopii
+        m = _new(Matrix)
+        m.n = self.n
+        data = self._data
+        m._data = values if type(data) is list else _fill(data[:], values)
+        return m
 
     def __add__(self, other: "Matrix") -> "Matrix":
         if not isinstance(other, Matrix):
             return NotImplemented
-        return Matrix(
-            self.a + other.a, self.b + other.b, self.c + other.c, self.d + other.d
-        )
+        if self.n != 2 or other.n != 2:
+            self._check(other)
+            return self._with(list(map(add, self._data, other._data)))
+        # 2x2 rozpisane ręcznie, jak w __mul__
+        a, b, c, d = self._data
+        e, f, g, h = other._data
+        m = _new(Matrix)
+        m.n = 2
+        m._data = [a + e, b + f, c + g, d + h]
+        return m
+
+    def __iadd__(self, other: "Matrix") -> "Matrix":
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.n != 2 or other.n != 2:
+            self._check(other)
+            self._data = _fill(self._data, list(map(add, self._data, other._data)))
+            return self
+        x = self._data
+        e, f, g, h = other._data
+        x[0] += e
+        x[1] += f
+        x[2] += g
+        x[3] += h
+        return self
 
     def __mul__(self, other: "Matrix") -> "Matrix":
         if not isinstance(other, Matrix):
             return NotImplemented
-        # Mnożenie macierzy 2x2
-        e, f, g, h = other.a, other.b, other.c, other.d
-        return Matrix(
-            self.a * e + self.b * g,  # element (1,1)
-            self.a * f + self.b * h,  # element (1,2)
-            self.c * e + self.d * g,  # element (2,1)
-            self.c * f + self.d * h,  # element (2,2)
+        if self.n != 2 or other.n != 2:
+            return self._with(self._product(other))
+        # 2x2 rozpisane ręcznie - to najczęstszy przypadek
+        a, b, c, d = self._data
+        e, f, g, h = other._data
+        m = _new(Matrix)
+        m.n = 2
+        m._data = [a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h]
+        return m
+
+    def __imul__(self, other: "Matrix") -> "Matrix":
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.n != 2 or other.n != 2:
+            self._data = _fill(self._data, self._product(other))
+            return self
+        x = self._data
+        a, b, c, d = x
+        e, f, g, h = other._data
+        x[0] = a * e + b * g
+        x[1] = a * f + b * h
+        x[2] = c * e + d * g
+        x[3] = c * f + d * h
+        return self
+
+    __matmul__ = __mul__
+    __imatmul__ = __imul__
+
+    def __pow__(self, k: int) -> "Matrix":
+        """Potęga macierzy przez podnoszenie do kwadratu - O(log k) mnożeń."""
+        if not isinstance(k, int):
+            return NotImplemented
+        if k < 0:
+            raise ValueError("Wykładnik musi być nieujemny")
+        n = self.n
+        # Jedynka i zero w typie elementów (1.0 dla float, 1 dla int, ...)
+        zero = self._data[0] * 0
+        one = zero + 1
+        result = [one if i % (n + 1) == 0 else zero for i in range(n * n)]
+        base = list(self._data)
+        while k:
+            if k & 1:
+                result = _matmul(result, base, n)
+            k >>= 1
+            if k:
+                base = _matmul(base, base, n)
+        return self._with(result)
+
+    @staticmethod
+    def _as_stack(matrices: Sequence["Matrix"]):
+        # Tablica (k, n, n) dla NumPy - tylko dla macierzy float tego samego rozmiaru
+        if np is None or not matrices:
+            return None
+        n = matrices[0].n
+        for m in matrices:
+            data = m._data
+            if m.n != n:
+                return None
+            if isinstance(data, array):
+                if data.typecode != "d":
+                    return None
+            elif not all(type(v) is float for v in data):
+                return None
+        return np.array([m._data for m in matrices], dtype=np.float64).reshape(
+            len(matrices), n, n
         )
 
+    @staticmethod
+    def _from_stack(stack) -> List["Matrix"]:
+        n = stack.shape[-1]
+        return [Matrix._from_flat(n, m.ravel().tolist()) for m in stack]
+
+    @staticmethod
+    def batch_mul(
+        lefts: Sequence["Matrix"], rights: Sequence["Matrix"]
+    ) -> List["Matrix"]:
+        """Iloczyny ``lefts[i] * rights[i]``; z NumPy liczone jednym ``matmul``."""
+        if len(lefts) != len(rights):
+            raise ValueError("Listy macierzy muszą mieć tę samą długość")
+        x, y = Matrix._as_stack(lefts), Matrix._as_stack(rights)
+        if x is not None and y is not None and x.shape == y.shape:
+            return Matrix._from_stack(np.matmul(x, y))
+        return [left * right for left, right in zip(lefts, rights)]
+
+    @staticmethod
+    def chain(matrices: Sequence["Matrix"]) -> "Matrix":
+        """Iloczyn ``m[0] * m[1] * ... * m[-1]`` (z zachowaniem kolejności)."""
+        if not matrices:
+            raise ValueError("Pusta lista macierzy")
+        stack = Matrix._as_stack(matrices)
+        if stack is not None:
+            # Redukcja parami: log2(k) wektorowych mnożeń zamiast k pojedynczych
+            while len(stack) > 1:
+                even = len(stack) - len(stack) % 2
+                paired = np.matmul(stack[0:even:2], stack[1:even:2])
+                stack = np.concatenate([paired, stack[even:]])
+            return Matrix._from_stack(stack)[0]
+        n = matrices[0].n
+        result = Matrix._from_flat(n, list(matrices[0]._data))
+        for m in matrices[1:]:
+            result *= m
+        return result
+
     def __str__(self) -> str:
-        return f"[{self.a}, {self.b};\n {self.c}, {self.d}]"
+        rows = (", ".join(map(str, row)) for row in self.tolist())
+        return "[" + ";\n ".join(rows) + "]"
 
     def __repr__(self) -> str:
-        return f"M({self.a}, {self.b}; {self.c}, {self.d})"
+        rows = (", ".join(map(str, row)) for row in self.tolist())
+        return "M(" + "; ".join(rows) + ")"
 
 
 class Student:
@@ -95,3 +519,104 @@ class Student:
 
     def __repr__(self) -> str:
         return f"Student({self.name!r}, {self.score})"
+
+
+class StudentRoster:
+    """Kolumnowy zbiór studentów z posortowanym indeksem wyników.
+
+    Imiona i wyniki trzymane są w równoległych kolumnach (wynik w
+    ``array('d')``), a osobny indeks utrzymuje pary (wynik, numer wiersza)
+    posortowane po obu polach - równe wyniki leżą w kolejności wierszy, więc
+    także konkretny wiersz da się znaleźć binarnie. Zapytania o pozycję, percentyl i liczbę wyników w
+    przedziale to wyszukiwanie binarne - O(log n), top-k to O(k). Dodanie
+    rekordu to wyszukiwanie binarne i wstawienie w bufor indeksu (jedno
+    przesunięcie pamięci, bez ponownego sortowania).
+    """
+
+    __slots__ = ("_names", "_scores", "_sorted_scores", "_sorted_rows")
+
+    def __init__(self, students: Iterable[Student] = ()):
+        self._names: List[str] = []
+        self._scores = array("d")
+        self._sorted_scores = array("d")
+        self._sorted_rows = array("q")
+        for student in students:
+            self.add(student.name, student.score)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __getitem__(self, row: int) -> Student:
+        return Student(self._names[row], self._scores[row])
+
+    def add(self, name: str, score: float) -> int:
+        row = len(self._names)
+        self._names.append(name)
+        self._scores.append(score)
+        # Nowy wiersz ma największy numer, więc trafia na koniec równych wyników
+        pos = bisect_right(self._sorted_scores, score)
+        self._sorted_scores.insert(pos, score)
+        self._sorted_rows.insert(pos, row)
+        return row
+
+    def _index_of(self, score: float, row: int) -> int:
+        # Pozycja pary (score, row): zakres równych wyników, w nim numer wiersza
+        low = bisect_left(self._sorted_scores, score)
+        high = bisect_right(self._sorted_scores, score, low)
+        return bisect_left(self._sorted_rows, row, low, high)
+
+    def update_score(self, row: int, score: float) -> None:
+        # Indeks trzyma numery nieujemne; -1 itd. jak w __getitem__ (IndexError)
+        row = range(len(self))[row]
+        pos = self._index_of(self._scores[row], row)
+        del self._sorted_scores[pos]
+        del self._sorted_rows[pos]
+        self._scores[row] = score
+        pos = self._index_of(score, row)
+        self._sorted_scores.insert(pos, score)
+        self._sorted_rows.insert(pos, row)
+
+    def rank_of(self, score: float) -> int:
+        """Miejsce w rankingu (1 = najlepszy); równe wyniki mają to samo miejsce."""
+        return len(self) - bisect_right(self._sorted_scores, score) + 1
+
+    def percentile(self, score: float) -> float:
+        """Ranga percentylowa: odsetek niższych wyników + połowa równych."""
+        if not self._names:
+            raise ValueError("Pusta lista studentów")
+        below = bisect_left(self._sorted_scores, score)
+        equal = bisect_right(self._sorted_scores, score) - below
+        return 100.0 * (below + 0.5 * equal) / len(self)
+
+    def range_count(self, low: float, high: float) -> int:
+        """Liczba wyników w przedziale domkniętym [low, high]."""
+        return max(
+            bisect_right(self._sorted_scores, high)
+            - bisect_left(self._sorted_scores, low),
+            0,
+        )
+
+    def top(self, k: int) -> List[Student]:
+        """``k`` najlepszych studentów, od najwyższego wyniku."""
+        rows = self._sorted_rows[len(self) - min(k, len(self)) :]
+        return [self[row] for row in reversed(rows)]
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: str,
+        name_column: str = "name",
+        score_column: str = "score",
+        encoding: str = "utf-8",
+    ) -> "StudentRoster":
+        """Wczytanie hurtowe: kolumny wypełniane wprost, indeks sortowany raz."""
+        roster = cls()
+        with open(path, "r", encoding=encoding, newline="") as f:
+            for record in csv.DictReader(f):
+                roster._names.append(record[name_column])
+                roster._scores.append(float(record[score_column]))
+        # sorted jest stabilne - równe wyniki zostają w kolejności wierszy
+        order = sorted(range(len(roster._scores)), key=roster._scores.__getitem__)
+        roster._sorted_rows = array("q", order)
+        roster._sorted_scores = array("d", (roster._scores[i] for i in order))
+        return roster
@@ -1,5 +1,93 @@
+import os
 import re
 from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+class CorpusStats:
+    """Częściowy wynik analizy korpusu; wyniki z wielu procesów łączy ``merge``."""
+
+    __slots__ = ("documents", "words", "chars", "frequencies", "sentiments")
+
+    def __init__(self) -> None:
+        self.documents = 0
+        self.words = 0
+        self.chars = 0
+        self.frequencies: Counter = Counter()
+        self.sentiments: Counter = Counter()
+
+    def merge(self, other: "CorpusStats") -> "CorpusStats":
+        self.documents += other.documents
+        self.words += other.words
+        self.chars += other.chars
+        self.frequencies.update(other.frequencies)
+        self.sentiments.update(other.sentiments)
+        return self
+
+    def report(self, top_k: int = 10) -> dict:
+        return {
+            "documents": self.documents,
+            "word_count": self.words,
+            "char_count": self.chars,
+            "unique_words": len(self.frequencies),
+            "top_words": self.frequencies.most_common(top_k),
+            "sentiments": dict(self.sentiments),
+        }
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+# Analizator przekazany raz do każdego procesu roboczego (initializer puli),
+# zamiast serializować go razem z każdym shardem
+_worker_analyzer: Optional["TextAnalyzer"] = None
+
+
+def _init_worker(analyzer: "TextAnalyzer") -> None:
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _run_in_worker(method: str, shard, kwargs: dict) -> CorpusStats:
+    return getattr(_worker_analyzer, method)(shard, **kwargs)
+
+
+def _map_reduce(
+    analyzer: "TextAnalyzer",
+    method: str,
+    shards: Iterable,
+    processes: int | None = None,
+    **kwargs,
+) -> CorpusStats:
+    total = CorpusStats()
+    workers = processes or os.cpu_count() or 1
+    if workers == 1:
+        fn = getattr(analyzer, method)
+        for shard in shards:
+            total.merge(fn(shard, **kwargs))
+        return total
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(analyzer,)
+    ) as pool:
+        pending = set()
+        for shard in shards:
+            pending.add(pool.submit(_run_in_worker, method, shard, kwargs))
+            # Ograniczona liczba zadań w locie - korpus nie trafia cały do pamięci
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+        for future in as_completed(pending):
+            total.merge(future.result())
+    return total
 
 
 class TextAnalyzer:
@@ -7,7 +95,7 @@ class TextAnalyzer:
     @staticmethod
     def _tokenize(text: str) -> list[str]:
         # Słowa definiowane jako sekwencja literr (interpunkcja i wielkość są ignorowane)
-        return re.findall(r"\b\w+\b", text.lower())
+        return _WORD_RE.findall(text.lower())
 
     def word_count(self, text: str) -> int:
         return len(self._tokenize(text))
@@ -18,8 +106,333 @@ class TextAnalyzer:
     def unique_words(self, text: str) -> int:
         return len(set(self._tokenize(text)))
 
+    def _sentiment_tracker(self) -> Optional["_SentimentTracker"]:
+        # Podklasy z sentymentem zwracają obiekt, któremu podaje się kolejne
+        # porcje słów dokumentu (w kolejności z tekstu)
+        return None
+
+    def _report(
+        self,
+        words: int,
+        chars: int,
+        vocabulary: Set[str],
+        tracker: Optional["_SentimentTracker"] = None,
+    ) -> dict:
+        report = {
+            "word_count": words,
+            "char_count": chars,
+            "unique_words": len(vocabulary),
+        }
+        if tracker is not None:
+            report["sentiment"] = tracker.result()[1]
+        return report
+
+    def analyze(self, text: str) -> dict:
+        """Wszystkie statystyki naraz, z jedną tokenizacją tekstu."""
+        tokens = self._tokenize(text)
+        tracker = self._sentiment_tracker()
+        if tracker is not None:
+            tracker.feed(tokens)
+        return self._report(len(tokens), len(text), set(tokens), tracker)
+
+    def analyze_stream(self, chunks: Iterable[str]) -> dict:
+        """Jak ``analyze``, ale dla tekstu podanego w kawałkach.
+
+        Słowo przecięte granicą kawałka jest doklejane do następnego, więc
+        wynik jest taki sam jak dla całego tekstu naraz, a w pamięci trzymany
+        jest tylko bieżący kawałek i zbiór unikalnych słów.
+        """
+        words = chars = 0
+        vocabulary: Set[str] = set()
+        tracker = self._sentiment_tracker()
+        for chunk_chars, tokens in self._chunk_tokens(chunks):
+            chars += chunk_chars
+            words += len(tokens)
+            vocabulary.update(tokens)
+            if tracker is not None:
+                tracker.feed(tokens)
+        return self._report(words, chars, vocabulary, tracker)
+
+    @staticmethod
+    def _chunk_tokens(chunks: Iterable[str]) -> Iterator[Tuple[int, list[str]]]:
+        # (liczba znaków kawałka, jego pełne słowa)
+        carry = ""
+        for chunk in chunks:
+            text = carry + chunk.lower()
+            carry = ""
+            tokens = _WORD_RE.findall(text)
+            # Ostatnie słowo może ciągnąć się w następnym kawałku
+            if tokens and _WORD_RE.match(text[-1]):
+                carry = tokens.pop()
+            yield len(chunk), tokens
+        if carry:
+            yield 0, [carry]
+
+    def analyze_file(
+        self, path: str, encoding: str = "utf-8", chunk_size: int = 1 << 20
+    ) -> dict:
+        """Analiza pliku czytanego kawałkami po ``chunk_size`` znaków."""
+        # newline="" - znaki końca linii liczone tak, jak są zapisane w pliku
+        with open(path, "r", encoding=encoding, newline="") as f:
+            return self.analyze_stream(iter(lambda: f.read(chunk_size), ""))
+
+    # Analiza korpusu (map-reduce na procesach)
+
+    @staticmethod
+    def _add_document(
+        stats: CorpusStats,
+        counts: Counter,
+        chars: int,
+        tracker: Optional["_SentimentTracker"],
+    ) -> None:
+        stats.documents += 1
+        stats.words += sum(counts.values())
+        stats.chars += chars
+        stats.frequencies.update(counts)
+        if tracker is not None:
+            stats.sentiments[tracker.result()[1]] += 1
+
+    def _documents_partial(self, documents: list[str]) -> CorpusStats:
+        stats = CorpusStats()
+        for text in documents:
+            tokens = self._tokenize(text)
+            tracker = self._sentiment_tracker()
+            if tracker is not None:
+                tracker.feed(tokens)
+            self._add_document(stats, Counter(tokens), len(text), tracker)
+        return stats
+
+    def _file_partial(self, path: str, encoding: str, chunk_size: int) -> CorpusStats:
+        stats = CorpusStats()
+        counts: Counter = Counter()
+        chars = 0
+        tracker = self._sentiment_tracker()
+        with open(path, "r", encoding=encoding, newline="") as f:
+            chunks = iter(lambda: f.read(chunk_size), "")
+            for chunk_chars, tokens in self._chunk_tokens(chunks):
+                chars += chunk_chars
+                counts.update(tokens)
+                if tracker is not None:
+                    tracker.feed(tokens)
+        self._add_document(stats, counts, chars, tracker)
+        return stats
+
+    def analyze_corpus(
+        self,
+        documents: Iterable[str],
+        top_k: int = 10,
+        processes: int | None = None,
+        batch_size: int = 256,
+    ) -> dict:
+        """Statystyki zbioru dokumentów liczone równolegle w puli procesów.
+
+        Dokumenty trafiają do procesów paczkami po ``batch_size``; każdy
+        proces zwraca ``CorpusStats``, które są na końcu scalane.
+        """
+        shards = _batched(documents, batch_size)
+        stats = _map_reduce(self, "_documents_partial", shards, processes)
+        return stats.report(top_k)
+
+    def analyze_files(
+        self,
+        paths: Iterable[str],
+        top_k: int = 10,
+        processes: int | None = None,
+        encoding: str = "utf-8",
+        chunk_size: int = 1 << 20,
+    ) -> dict:
+        """Jak ``analyze_corpus``, ale każdy plik to osobny dokument (shard)."""
+        stats = _map_reduce(
+            self,
+            "_file_partial",
+            paths,
+            processes,
+            encoding=encoding,
+            chunk_size=chunk_size,
+        )
+        return stats.report(top_k)
+
+
+class _LexiconNode:
+
+    __slots__ = ("exact", "stems", "stem_lengths", "weight")
+
+    def __init__(self) -> None:
+        self.exact: Dict[str, "_LexiconNode"] = {}
+        self.stems: Dict[str, "_LexiconNode"] = {}
+        # Długości rdzeni malejąco - najdłuższy rdzeń sprawdzany pierwszy
+        self.stem_lengths: Tuple[int, ...] = ()
+        self.weight: Optional[float] = None
+
+
+class SentimentLexicon:
+    """Słownik sentymentu skompilowany do drzewa (trie) po słowach.
+
+    Hasłem może być słowo, fraza wielowyrazowa albo rdzeń zakończony ``*``
+    (np. ``wspania*`` pasuje do „wspaniały”, „wspaniałej”, …). Tekst jest
+    przeglądany raz od lewej; w każdej pozycji wybierane jest najdłuższe
+    pasujące hasło, więc koszt zależy od długości tekstu, a nie od rozmiaru
+    słownika.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, float]] = ()) -> None:
+        self._root = _LexiconNode()
+        self.size = 0
+        self.max_phrase_len = 0
+        for phrase, weight in entries:
+            self.add(phrase, weight)
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = "utf-8") -> "SentimentLexicon":
+        """Wczytuje plik TSV: ``fraza<TAB>waga``; ``#`` rozpoczyna komentarz."""
+        lexicon = cls()
+        with open(path, "r", encoding=encoding) as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    phrase, weight = line.rsplit("\t", 1)
+                    lexicon.add(phrase, float(weight))
+                except ValueError as e:
+                    msg = f"{path}:{line_no}: niepoprawny wpis {line!r}"
+                    raise ValueError(msg) from e
+        return lexicon
+
+    def add(self, phrase: str, weight: float) -> None:
+        words = phrase.lower().split()
+        if not words:
+            raise ValueError("Pusta fraza")
+        node = self._root
+        for word in words:
+            if word.endswith("*") and len(word) > 1:
+                stem = word[:-1]
+                child = node.stems.get(stem)
+                if child is None:
+                    child = node.stems[stem] = _LexiconNode()
+                    lengths = set(node.stem_lengths) | {len(stem)}
+                    node.stem_lengths = tuple(sorted(lengths, reverse=True))
+            else:
+                child = node.exact.get(word)
+                if child is None:
+                    child = node.exact[word] = _LexiconNode()
+            node = child
+        if node.weight is None:
+            self.size += 1
+        node.weight = weight
+        self.max_phrase_len = max(self.max_phrase_len, len(words))
+
+    @staticmethod
+    def _children(node: _LexiconNode, token: str) -> List[_LexiconNode]:
+        # Dokładne dopasowanie ma pierwszeństwo przed rdzeniami
+        found = []
+        child = node.exact.get(token)
+        if child is not None:
+            found.append(child)
+        for length in node.stem_lengths:
+            if length <= len(token):
+                child = node.stems.get(token[:length])
+                if child is not None:
+                    found.append(child)
+        return found
+
+    def _longest_match(self, tokens: List[str], start: int) -> Tuple[int, float]:
+        end, weight = start, 0.0
+        frontier = self._children(self._root, tokens[start])
+        pos = start + 1
+        while frontier:
+            for node in frontier:
+                if node.weight is not None:
+                    end, weight = pos, node.weight
+                    break
+            if pos >= len(tokens):
+                break
+            token = tokens[pos]
+            frontier = [
+                child for node in frontier for child in self._children(node, token)
+            ]
+            pos += 1
+        return end, weight
+
+    def score_prefix(self, tokens: List[str], final: bool = True) -> Tuple[float, int]:
+        """(suma wag, liczba rozstrzygniętych słów) dla ciągu słów.
+
+        Przy ``final=False`` zatrzymuje się, gdy dalsze słowa mogłyby jeszcze
+        przedłużyć hasło - zostaje najwyżej ``max_phrase_len - 1`` słów, które
+        trzeba dokleić przed następną porcją.
+        """
+        score = 0.0
+        pos = 0
+        stop = len(tokens) if final else len(tokens) - self.max_phrase_len + 1
+        while pos < stop:
+            end, weight = self._longest_match(tokens, pos)
+            if end > pos:
+                score += weight
+                pos = end
+            else:
+                pos += 1
+        return score, pos
+
+    def score_tokens(self, tokens: List[str]) -> float:
+        """Suma wag haseł znalezionych w ciągu (małych liter) słów."""
+        return self.score_prefix(tokens)[0]
+
+    @staticmethod
+    def label(score: float) -> str:
+        if score > 0:
+            return "Pozytywny"
+        if score < 0:
+            return "Negatywny"
+        return "Neutralny"
+
+
+class _SentimentTracker:
+    """Sentyment dokumentu liczony z kolejnych porcji jego słów.
+
+    Ze słownikiem porcje są oceniane po kolei, a ostatnie słowa, które mogą
+    być początkiem frazy, przechodzą do następnej porcji - wynik jest taki
+    sam jak dla całego ciągu słów naraz. Bez słownika wystarczy zbiór
+    trafionych słów kluczowych.
+    """
+
+    __slots__ = ("_analyzer", "_pending", "_score", "_hits")
+
+    def __init__(self, analyzer: "AdvancedTextAnalyzer") -> None:
+        self._analyzer = analyzer
+        self._pending: List[str] = []
+        self._score = 0.0
+        self._hits: Set[str] = set()
+
+    def feed(self, tokens: List[str]) -> None:
+        lexicon = self._analyzer.lexicon
+        if lexicon is None:
+            keywords = self._analyzer._keywords
+            self._hits.update(t for t in tokens if t in keywords)
+            return
+        buffer = self._pending + tokens if self._pending else tokens
+        score, done = lexicon.score_prefix(buffer, final=False)
+        self._score += score
+        self._pending = buffer[done:]
+
+    def result(self) -> Tuple[float, str]:
+        analyzer = self._analyzer
+        if analyzer.lexicon is None:
+            pos_hits = len(self._hits & analyzer._positive)
+            neg_hits = len(self._hits & analyzer._negative)
+            return pos_hits - neg_hits, analyzer._sentiment(self._hits)
+        if self._pending:
+            self._score += analyzer.lexicon.score_prefix(self._pending)[0]
+            self._pending = []
+        return self._score, analyzer.lexicon.label(self._score)
+
 
 class AdvancedTextAnalyzer(TextAnalyzer):
+    """Analizator z sentymentem.
+
+    Bez słownika używa wbudowanych zbiorów słów; z ``SentimentLexicon`` liczy
+    ważony wynik, także dla fraz - również przy analizie strumieniowej,
+    plików i korpusu.
+    """
 
     _positive = {
         "wspaniały",
@@ -31,9 +444,25 @@ class AdvancedTextAnalyzer(TextAnalyzer):
         "miły",
     }
     _negative = {"okropny", "zły", "fatalny", "straszny", "ponury", "zniechęcający"}
+    _keywords = _positive | _negative
 
-    def sentiment_analysis(self, text: str) -> str:
-        tokens = set(self._tokenize(text))
+    def __init__(self, lexicon: Optional[SentimentLexicon] = None) -> None:
+        self.lexicon = lexicon
+
+    def _sentiment_tracker(self) -> _SentimentTracker:
+        return _SentimentTracker(self)
+
+    def _score(self, tokens: Iterable[str]) -> Tuple[float, str]:
+        if self.lexicon is not None:
+            score = self.lexicon.score_tokens(list(tokens))
+            return score, self.lexicon.label(score)
+
+        vocabulary = set(tokens)
+        pos_hits = vocabulary & self._positive
+        neg_hits = vocabulary & self._negative
+        return len(pos_hits) - len(neg_hits), self._sentiment(vocabulary)
+
+    def _sentiment(self, tokens: Set[str]) -> str:
         pos_hits = tokens & self._positive
         neg_hits = tokens & self._negative
 
@@ -44,16 +473,27 @@ class AdvancedTextAnalyzer(TextAnalyzer):
         # Jeżeli mieszane albo brak słów-kluczy
         return "Neutralny"
 
+    def sentiment_analysis(self, text: str) -> str:
+        return self._score(self._tokenize(text))[1]
+
+    def score_many(self, texts: Iterable[str]) -> List[Tuple[float, str]]:
+        """Wynik i etykieta sentymentu dla każdego tekstu z paczki."""
+        findall, score = _WORD_RE.findall, self._score
+        return [score(findall(text.lower())) for text in texts]
+
 
 # Przykładowe użycie i test
-ta = AdvancedTextAnalyzer()
-sample_texts = [
-    "To był naprawdę wspaniały dzień!",
-    "To był naprawdę okropny dzień!",
-    "Dzisiaj po prostu dzień jak co dzień.",
-]
-for t in sample_texts:
-    print(
-        f'"{t}" → słowa={ta.word_count(t)},  znaki={ta.char_count(t)}, '
-        f"unikalne={ta.unique_words(t)},  sentyment={ta.sentiment_analysis(t)}"
-    )
+if __name__ == "__main__":
+    ta = AdvancedTextAnalyzer()
+    sample_texts = [
+        "To był naprawdę wspaniały dzień!",
+        "To był naprawdę okropny dzień!",
+        "Dzisiaj po prostu dzień jak co dzień.",
+    ]
+    for t in sample_texts:
+        r = ta.analyze(t)
+        print(
+            f'"{t}" → słowa={r["word_count"]},  znaki={r["char_count"]}, '
+            f'unikalne={r["unique_words"]},  sentyment={r["sentiment"]}'
+        )
+    print(ta.analyze_corpus(sample_texts * 1000, top_k=3))
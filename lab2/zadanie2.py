@@ -1,3 +1,14 @@
+try:
+    import numpy as np
+except ImportError:  # classify_many wymaga NumPy, classify działa bez niego
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
 class NegativeValueError(ValueError):
 
     pass
@@ -5,6 +16,19 @@ class NegativeValueError(ValueError):
 
 class DataClassifier:
 
+    LABELS = ("Niska wartość", "Średnia wartość", "Wysoka wartość")
+
+    # Kody błędów zwracane przez classify_many zamiast wyjątków
+    OK = 0
+    INVALID_TYPE = 1  # odpowiednik TypeError
+    NEGATIVE = 2  # odpowiednik NegativeValueError
+
+    def __init__(self, low: float = 30, high: float = 70):
+        if low > high:
+            raise ValueError("Próg 'low' nie może być większy niż 'high'.")
+        self.low = low
+        self.high = high
+
     def classify(self, value):
         # Walidacja typu
         if not isinstance(value, (int, float)):
@@ -15,11 +39,74 @@ class DataClassifier:
             raise NegativeValueError("Wartość nie może być ujemna.")
 
         # Klasyfikacja
-        if value < 30:
-            return "Niska wartość"
-        if value <= 70:
-            return "Średnia wartość"
-        return "Wysoka wartość"
+        if value < self.low:
+            return self.LABELS[0]
+        if value <= self.high:
+            return self.LABELS[1]
+        return self.LABELS[2]
+
+    @staticmethod
+    def _as_float_array(values):
+        # Zwraca (wartości jako float64, maska poprawnego typu)
+        if pd is not None and isinstance(values, pd.Series):
+            arr = values.to_numpy()
+        else:
+            arr = np.asarray(values)
+        if arr.dtype.kind in "biuf":
+            floats = arr.astype(np.float64)
+            return floats, ~np.isnan(floats)
+
+        # Dane mieszane (np. z tekstami) - wolniejsza ścieżka element po elemencie.
+        # Lista [1, "a"] daje w NumPy tablicę napisów, więc wracamy do obiektów.
+        if arr.dtype.kind != "O":
+            arr = np.asarray(values, dtype=object)
+        flat = arr.ravel()
+        valid = np.fromiter(
+            (isinstance(v, (int, float)) for v in flat), dtype=bool, count=flat.size
+        )
+        floats = np.full(flat.size, np.nan)
+        floats[valid] = [float(v) for v in flat[valid]]
+        valid &= ~np.isnan(floats)
+        return floats.reshape(arr.shape), valid.reshape(arr.shape)
+
+    def classify_many(self, values):
+        """Wektorowa wersja ``classify`` dla tablic NumPy i serii pandas.
+
+        Zwraca parę ``(etykiety, kody_błędów)``. Etykiety to ``pd.Categorical``
+        (``pd.Series`` z tym samym indeksem dla serii wejściowej) albo, bez
+        pandas, tablica obiektów z ``None`` w miejscu błędów. Kody błędów to
+        tablica ``OK`` / ``INVALID_TYPE`` / ``NEGATIVE``; ``kody == OK`` daje
+        maskę poprawnych wartości. NaN traktowany jest jak wartość
+        niepoprawnego typu. Dane muszą być jednowymiarowe (``ValueError``
+        w przeciwnym razie).
+        """
+        if np is None:
+            raise ImportError("classify_many wymaga pakietu numpy")
+
+        floats, valid_type = self._as_float_array(values)
+        if floats.ndim != 1:
+            # pd.Categorical jest zawsze 1-D, a kody błędów zachowałyby kształt
+            raise ValueError(
+                f"classify_many przyjmuje dane jednowymiarowe, a nie {floats.ndim}-D."
+            )
+        negative = valid_type & (floats < 0)
+        errors = np.where(
+            valid_type, np.where(negative, self.NEGATIVE, self.OK), self.INVALID_TYPE
+        ).astype(np.int8)
+
+        # Te same granice co w classify: < low, <= high, reszta
+        with np.errstate(invalid="ignore"):
+            codes = (floats >= self.low).astype(np.int8) + (floats > self.high)
+        codes[errors != self.OK] = -1
+
+        if pd is None:
+            labels = np.array(self.LABELS + (None,), dtype=object)[codes]
+            return labels, errors
+
+        labels = pd.Categorical.from_codes(codes, categories=list(self.LABELS))
+        if isinstance(values, pd.Series):
+            labels = pd.Series(labels, index=values.index, name=values.name)
+        return labels, errors
 
 
 # Przykładowe użycie z obsługą wyjątków
@@ -32,3 +119,7 @@ if __name__ == "__main__":
             print(f"{v!r} → {classifier.classify(v)}")
         except Exception as e:
             print(f"{v!r} → Błąd: {e}")
+
+    if np is not None:
+        labels, errors = classifier.classify_many(test_inputs)
+        print(list(labels), errors.tolist())
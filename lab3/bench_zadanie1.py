@@ -0,0 +1,70 @@
+"""Pomiar czasu odpowiedzi InteligentnyAsystent z zadanie1.py.
+
+Buduje syntetyczne bazy po 10 do ``--max`` intencji (połowa z wyzwalaczami
+dwuwyrazowymi) i mierzy średni czas ``odpowiedz`` bez cache oraz z cache
+(LRU zapytanie -> odpowiedź) dla 100 powtarzających się zapytań. Czas bez
+cache powinien być płaski niezależnie od liczby intencji:
+
+    python bench_zadanie1.py
+    python bench_zadanie1.py --max 100000 --queries 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from zadanie1 import BazaIntencji, InteligentnyAsystent
+
+
+def _baza(liczba: int) -> BazaIntencji:
+    baza = BazaIntencji()
+    for i in range(liczba):
+        wyzwalacze = [f"slowo{i}"] + ([f"fraza {i}"] if i % 2 else [])
+        baza.dodaj(f"intencja{i}", wyzwalacze, f"Odpowiedz {i}")
+    return baza
+
+
+def _zapytania(liczba_intencji: int, ile: int, rng: random.Random) -> List[str]:
+    wzorce = ("powiedz mi cos o slowo{}", "fraza {} prosze", "nic tu nie ma {}")
+    return [
+        rng.choice(wzorce).format(rng.randrange(liczba_intencji)) for _ in range(ile)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'intencje':>9} {'bez cache us':>13} {'z cache us':>11}")
+    liczba = 10
+    while liczba <= args.max:
+        baza = _baza(liczba)
+        zapytania = _zapytania(liczba, args.queries, rng)
+
+        bez_cache = InteligentnyAsystent("Bench", "1.0", baza, rozmiar_cache=0)
+        start = time.perf_counter()
+        for zapytanie in zapytania:
+            bez_cache.odpowiedz(zapytanie)
+        zimne_us = (time.perf_counter() - start) / len(zapytania) * 1e6
+
+        # Osobne wywołania odpowiedz - odpowiedz_many usuwa duplikaty sam
+        # i nie sięgałby do cache
+        z_cache = InteligentnyAsystent("Bench", "1.0", baza)
+        popularne = zapytania[:100] * (len(zapytania) // 100)
+        start = time.perf_counter()
+        for zapytanie in popularne:
+            z_cache.odpowiedz(zapytanie)
+        cache_us = (time.perf_counter() - start) / len(popularne) * 1e6
+
+        print(f"{liczba:>9} {zimne_us:>13.2f} {cache_us:>11.2f}")
+        liczba *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Pomiar SessionManager z zadanie5.py dla wielu równoległych rozmów.
+
+Otwiera ``--sessions`` sesji na jednej pętli asyncio, wszystkie na wspólnej
+krotce pytań. Użytkownik jest symulowany opóźnieniem ``--think-ms``.
+Raport: pamięć na sesję (tracemalloc, razem z zadaniem asyncio) oraz czas
+obrotu jednej tury (p50/p95) ponad samo opóźnienie:
+
+    python bench_zadanie5.py
+    python bench_zadanie5.py --sessions 10000 50000 --turns 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import List
+
+from zadanie5 import ChatSession, SessionManager
+
+
+async def _run(sessions: int, turns: int, think_s: float) -> tuple:
+    questions = tuple(f"Pytanie {i}?" for i in range(turns))
+    overheads: List[float] = []
+
+    async def answer(session: ChatSession, question: str) -> str:
+        start = time.perf_counter()
+        await asyncio.sleep(think_s)
+        overheads.append(time.perf_counter() - start - think_s)
+        return "ok"
+
+    manager = SessionManager(answer)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(sessions):
+        manager.open(i, questions)
+    per_session = (tracemalloc.get_traced_memory()[0] - before) / sessions
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    await manager.join()
+    elapsed = time.perf_counter() - start
+    return per_session, elapsed, overheads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--think-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'sesje':>8} {'B/sesja':>8} {'czas s':>7} {'tury/s':>9} "
+        f"{'p50 ms':>7} {'p95 ms':>7}"
+    )
+    for sessions in args.sessions:
+        per_session, elapsed, overheads = asyncio.run(
+            _run(sessions, args.turns, args.think_ms / 1000)
+        )
+        p50 = statistics.median(overheads) * 1000
+        p95 = statistics.quantiles(overheads, n=20)[-1] * 1000
+        print(
+            f"{sessions:>8} {per_session:>8.0f} {elapsed:>7.2f} "
+            f"{len(overheads) / elapsed:>9.0f} {p50:>7.2f} {p95:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
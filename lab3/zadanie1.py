@@ -1,5 +1,10 @@
 from __future__ import annotations
-from typing import Dict
+
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 
 class Asystent:
@@ -8,37 +13,135 @@ class Asystent:
         self.wersja = wersja
 
 
+_TOKEN_RE = re.compile(r"\w+")
+
+INTENCJE_PLIK = Path(__file__).with_name("intencje.json")
+DOMYSLNA_ODPOWIEDZ = "Przykro mi, nie rozumiem pytania."
+
+
+def tokenizuj(tekst: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN_RE.findall(tekst.lower()))
+
+
+class BazaIntencji:
+    """Tablica dyspozycyjna: krotka tokenów wyzwalacza -> intencja.
+
+    Wyzwalacze mogą mieć kilka słów ("dzień dobry"). Dopasowanie szuka
+    najdłuższego wyzwalacza od najwcześniejszej pozycji w zapytaniu, więc
+    koszt zależy od długości zapytania, a nie od liczby intencji.
+    """
+
+    def __init__(self) -> None:
+        self._tabela: Dict[Tuple[str, ...], str] = {}
+        self._odpowiedzi: Dict[str, str] = {}
+        self._max_dl = 0
+
+    @classmethod
+    def z_pliku(cls, sciezka: Union[str, Path] = INTENCJE_PLIK) -> "BazaIntencji":
+        """Wczytuje listę ``{"intencja", "wyzwalacze", "odpowiedz"}`` z JSON."""
+        baza = cls()
+        with open(sciezka, encoding="utf-8") as f:
+            for wpis in json.load(f):
+                baza.dodaj(wpis["intencja"], wpis["wyzwalacze"], wpis["odpowiedz"])
+        return baza
+
+    def dodaj(self, intencja: str, wyzwalacze: Iterable[str], odpowiedz: str) -> None:
+        for wyzwalacz in wyzwalacze:
+            klucz = tokenizuj(wyzwalacz)
+            if not klucz:
+                raise ValueError(f"Pusty wyzwalacz w intencji {intencja!r}")
+            poprzednia = self._tabela.get(klucz)
+            if poprzednia is not None and poprzednia != intencja:
+                raise ValueError(
+                    f"Wyzwalacz {wyzwalacz!r} należy już do intencji {poprzednia!r}"
+                )
+            self._tabela[klucz] = intencja
+            self._max_dl = max(self._max_dl, len(klucz))
+        self._odpowiedzi[intencja] = odpowiedz
+
+    def dopasuj(self, tokeny: Sequence[str]) -> Optional[str]:
+        for i in range(len(tokeny)):
+            for n in range(min(self._max_dl, len(tokeny) - i), 0, -1):
+                intencja = self._tabela.get(tuple(tokeny[i : i + n]))
+                if intencja is not None:
+                    return intencja
+        return None
+
+    def odpowiedz(self, intencja: Optional[str]) -> str:
+        return self._odpowiedzi.get(intencja or "", DOMYSLNA_ODPOWIEDZ)
+
+    def __len__(self) -> int:
+        return len(self._odpowiedzi)
+
+
 class AnalizaJezykowa:
+    def __init__(self, baza: BazaIntencji) -> None:
+        self.baza = baza
+
     def analizuj_zapytanie(self, zapytanie: str) -> Dict[str, str]:
-        # Tu powinien być NLP
-        klucz = zapytanie.lower().split()[0]
-        return {"intencja": klucz}
+        # Tu powinien być NLP
+        intencja = self.baza.dopasuj(tokenizuj(zapytanie))
+        return {"intencja": intencja or ""}
 
 
 class GeneratorOdpowiedzi:
+    def __init__(self, baza: BazaIntencji) -> None:
+        self.baza = baza
+
     def generuj_odpowiedz(self, analiza: Dict[str, str]) -> str:
-        match analiza.get("intencja"):
-            case "hej" | "cześć":
-                return "Cześć! W czym mogę pomóc?"
-            case "pogoda":
-                return "Dziś słonecznie ☀️"
-            case _:
-                return "Przykro mi, nie rozumiem pytania."
+        return self.baza.odpowiedz(analiza.get("intencja"))
 
 
 class InteligentnyAsystent(Asystent):
 
-    def __init__(self, nazwa: str, wersja: str) -> None:
+    def __init__(
+        self,
+        nazwa: str,
+        wersja: str,
+        baza: Optional[BazaIntencji] = None,
+        rozmiar_cache: int = 1024,
+    ) -> None:
         super().__init__(nazwa, wersja)
-        self.analityk = AnalizaJezykowa()
-        self.generator = GeneratorOdpowiedzi()
+        self.baza = baza if baza is not None else BazaIntencji.z_pliku()
+        self.analityk = AnalizaJezykowa(self.baza)
+        self.generator = GeneratorOdpowiedzi(self.baza)
+        # Ostatnie zapytania -> odpowiedzi, najstarsze wypadają jako pierwsze
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._rozmiar_cache = rozmiar_cache
 
     def odpowiedz(self, zapytanie: str) -> str:
+        odpowiedz = self._cache.get(zapytanie)
+        if odpowiedz is not None:
+            self._cache.move_to_end(zapytanie)
+            return odpowiedz
+
         analiza = self.analityk.analizuj_zapytanie(zapytanie)
-        return self.generator.generuj_odpowiedz(analiza)
+        odpowiedz = self.generator.generuj_odpowiedz(analiza)
+        if self._rozmiar_cache > 0:
+            self._cache[zapytanie] = odpowiedz
+            if len(self._cache) > self._rozmiar_cache:
+                self._cache.popitem(last=False)
+        return odpowiedz
+
+    def odpowiedz_many(self, zapytania: Iterable[str]) -> List[str]:
+        """Odpowiedzi na wiele zapytań; powtórzenia liczone są tylko raz."""
+        wyniki: Dict[str, str] = {}
+        odpowiedzi = []
+        for zapytanie in zapytania:
+            if zapytanie not in wyniki:
+                wyniki[zapytanie] = self.odpowiedz(zapytanie)
+            odpowiedzi.append(wyniki[zapytanie])
+        return odpowiedzi
+
+    def dodaj_intencje(
+        self, intencja: str, wyzwalacze: Iterable[str], odpowiedz: str
+    ) -> None:
+        self.baza.dodaj(intencja, wyzwalacze, odpowiedz)
+        self._cache.clear()
 
 
 # Prosty test
 if __name__ == "__main__":
     bot = InteligentnyAsystent("KompoBot", "1.0")
     print(bot.odpowiedz("hej"))
+    print(bot.odpowiedz_many(["Dzień dobry!", "jaka pogoda jutro?", "co?", "hej"]))
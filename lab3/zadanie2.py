@@ -1,11 +1,127 @@
-from typing import Iterable
+import math
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # bez NumPy działa ścieżka element po elemencie
+    np = None
+
+
+class RunningStats:
+    """Licznik, średnia, wariancja, min i max liczone w stałej pamięci.
+
+    Suma ``total`` liczona jest dokładnie, w typie danych (``Decimal``,
+    ``Fraction``; float z kompensacją jak ``sum``), więc ``total / count`` daje
+    tę samą średnią co suma listy. Wariancja aktualizowana metodą Welforda;
+    ``merge`` łączy wyniki kawałków danych (np. z różnych procesów) wzorem
+    Chana, bez ponownego przechodzenia danych.
+    """
+
+    __slots__ = ("count", "_total", "_compensation", "mean", "_m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._total = 0
+        self._compensation = 0.0  # zgubione bity sumy float (Neumaier)
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def total(self):
+        if self._compensation:
+            return self._total + self._compensation
+        return self._total
+
+    def _add_total(self, value) -> None:
+        total = self._total + value
+        if (
+            isinstance(value, float)
+            and isinstance(self._total, float)
+            and math.isfinite(total)
+        ):
+            if abs(self._total) >= abs(value):
+                self._compensation += (self._total - total) + value
+            else:
+                self._compensation += (value - total) + self._total
+        self._total = total
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        if self.count == 1:
+            # Start od pierwszej wartości - zachowuje jej typ (np. Decimal)
+            self._total = self.mean = self.min = self.max = value
+            self._m2 = value - value
+            return
+        self._add_total(value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update_many(self, values: Iterable[float]) -> "RunningStats":
+        if np is not None and isinstance(values, np.ndarray):
+            arr = values.ravel().astype(np.float64, copy=False)
+            if arr.size:
+                chunk = RunningStats()
+                chunk.count = int(arr.size)
+                chunk._total = float(arr.sum())
+                chunk.mean = float(arr.mean())
+                chunk._m2 = float(((arr - chunk.mean) ** 2).sum())
+                chunk.min = float(arr.min())
+                chunk.max = float(arr.max())
+                self.merge(chunk)
+            return self
+        for value in values:
+            self.update(value)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self._total, self._compensation = other._total, other._compensation
+            self.min, self.max = other.min, other.max
+            return self
+        self._add_total(other._total)
+        if other._compensation:
+            self._compensation += other._compensation
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof: int = 0) -> Optional[float]:
+        """Wariancja populacji (``ddof=0``) lub próby (``ddof=1``)."""
+        if self.count <= ddof:
+            return None
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 0) -> Optional[float]:
+        var = self.variance(ddof)
+        return math.sqrt(var) if var is not None else None
+
+    def __repr__(self) -> str:
+        return (
+            f"RunningStats(count={self.count}, mean={self.mean}, "
+            f"var={self.variance()}, min={self.min}, max={self.max})"
+        )
 
 
 def average(values: Iterable[float]) -> float:
-    nums = list(values)
-    if not nums:
+    stats = RunningStats().update_many(values)
+    if not stats.count:
         raise ValueError("Lista jest pusta")
-    return sum(nums) / len(nums)
+    return stats.total / stats.count
 
 
 print(average([1.0, 2.5, 3.5]))
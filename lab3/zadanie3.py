@@ -1,19 +1,124 @@
-from typing import Dict, Optional
+import sqlite3
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+def _prefix_bounds(prefix: str) -> Tuple[str, Optional[str]]:
+    # Zakres [prefix, następny_prefix) - korzysta z indeksu, w przeciwieństwie do LIKE
+    if not prefix:
+        return "", None
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
 
 
 class Library:
-    def __init__(self) -> None:
-        self._books: Dict[str, str] = {}
+    """Katalog książek w SQLite, indeksowany po ISBN i po tytule.
+
+    Bez ścieżki baza działa w pamięci (jak dawny słownik); ze ścieżką dane
+    przetrwają restart, a start nie wczytuje katalogu do RAM - zapytania
+    czytają z dysku tylko potrzebne strony indeksu.
+    """
+
+    def __init__(self, path: str = ":memory:", cache_kib: int = 16 * 1024) -> None:
+        # isolation_level=None - każde add_book zapisuje się od razu
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute(f"PRAGMA cache_size = -{int(cache_kib)}")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS books (
+                isbn TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                title_key TEXT NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS books_title_key ON books (title_key, isbn)"
+        )
 
     def add_book(self, isbn: str, title: str) -> None:
-        self._books[isbn] = title
+        self._conn.execute(
+            "INSERT OR REPLACE INTO books (isbn, title, title_key) VALUES (?, ?, ?)",
+            (isbn, title, title.casefold()),
+        )
 
     def find_book(self, isbn: str) -> Optional[str]:
-        return self._books.get(isbn)
+        row = self._conn.execute(
+            "SELECT title FROM books WHERE isbn = ?", (isbn,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def import_books(
+        self, books: Iterable[Tuple[str, str]], batch_size: int = 50_000
+    ) -> int:
+        """Import hurtowy par (isbn, tytuł) w jednej transakcji; zwraca liczbę."""
+        rows = ((isbn, title, title.casefold()) for isbn, title in books)
+        count = 0
+        self._conn.execute("BEGIN")
+        try:
+            while batch := list(islice(rows, batch_size)):
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO books (isbn, title, title_key) "
+                    "VALUES (?, ?, ?)",
+                    batch,
+                )
+                count += len(batch)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return count
+
+    def _range(self, column: str, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        low, high = _prefix_bounds(prefix)
+        sql = f"SELECT isbn, title FROM books WHERE {column} >= ?"
+        params: list = [low]
+        if high is not None:
+            sql += f" AND {column} < ?"
+            params.append(high)
+        sql += f" ORDER BY {column}, isbn LIMIT ?"
+        params.append(limit)
+        return self._conn.execute(sql, params).fetchall()
+
+    def search_isbn(self, prefix: str, limit: int = 100) -> List[Tuple[str, str]]:
+        return self._range("isbn", prefix, limit)
+
+    def search_title(self, prefix: str, limit: int = 100) -> List[Tuple[str, str]]:
+        """Wyszukiwanie po początku tytułu, bez rozróżniania wielkości liter."""
+        return self._range("title_key", prefix.casefold(), limit)
+
+    def page(self, after: str = "", size: int = 1000) -> List[Tuple[str, str]]:
+        """Kolejna strona katalogu w porządku ISBN, zaczynając za ``after``."""
+        return self._conn.execute(
+            "SELECT isbn, title FROM books WHERE isbn > ? ORDER BY isbn LIMIT ?",
+            (after, size),
+        ).fetchall()
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        after = ""
+        while rows := self.page(after):
+            yield from rows
+            after = rows[-1][0]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "Library":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
 
 # Test
-lib = Library()
-lib.add_book("9788301234567", "Algorytmy w Pythonie")
-print(lib.find_book("9788301234567"))
-print(lib.find_book("000"))
+if __name__ == "__main__":
+    lib = Library()
+    lib.add_book("9788301234567", "Algorytmy w Pythonie")
+    print(lib.find_book("9788301234567"))
+    print(lib.find_book("000"))
+    print(lib.search_title("algo"), lib.search_isbn("978830"))
@@ -1,4 +1,9 @@
-from typing import Iterator
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+# Blok wartości F(0)..F(_BLOCK - 1) liczony raz, przy pierwszym użyciu
+_BLOCK = 1024
+_block: List[int] = []
 
 
 def fibonacci() -> Iterator[int]:
@@ -8,8 +13,53 @@ def fibonacci() -> Iterator[int]:
         a, b = b, a + b
 
 
+def _check(n: int, mod: Optional[int]) -> None:
+    if n < 0:
+        raise ValueError("Indeks musi być nieujemny")
+    if mod is not None and mod <= 0:
+        raise ValueError("Moduł musi być dodatni")
+
+
+def _fib_pair(n: int, mod: Optional[int] = None) -> Tuple[int, int]:
+    # (F(n), F(n+1)) metodą szybkiego podwajania - O(log n) kroków:
+    # F(2k) = F(k) * (2F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+    if n + 1 < _BLOCK:
+        if not _block:
+            _block.extend(islice(fibonacci(), _BLOCK))
+        a, b = _block[n], _block[n + 1]
+        return (a % mod, b % mod) if mod else (a, b)
+
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod:
+            c, d = c % mod, d % mod
+        if bit == "1":
+            a, b = d, c + d
+            if mod:
+                b %= mod
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fib(n: int, mod: Optional[int] = None) -> int:
+    """F(n) (albo F(n) mod ``mod``) bez liczenia wszystkich poprzednich wyrazów."""
+    _check(n, mod)
+    return _fib_pair(n, mod)[0]
+
+
+def fib_range(start: int, stop: int, mod: Optional[int] = None) -> Iterator[int]:
+    """Wyrazy F(start)..F(stop - 1); skok do ``start`` w O(log start)."""
+    _check(start, mod)
+    a, b = _fib_pair(start, mod)
+    for _ in range(start, stop):
+        yield a
+        a, b = b, (a + b) % mod if mod else a + b
+
+
 # Użycie
 if __name__ == "__main__":
-    from itertools import islice
-
     print(list(islice(fibonacci(), 10)))
+    print(fib(10**6, mod=10**9 + 7), list(fib_range(10**6, 10**6 + 3, mod=1000)))
@@ -1,8 +1,27 @@
-from collections.abc import Iterator
-from typing import List
+import asyncio
+from collections.abc import AsyncIterator, Iterator, Sequence
+from functools import lru_cache
+from typing import (
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Set,
+    Tuple,
+    Union,
+)
+
+# Źródło pytań: wspólna lista/krotka, generator, async generator albo kolejka,
+# w której None oznacza koniec rozmowy
+QuestionSource = Union[Sequence[str], Iterable[str], AsyncIterable[str], asyncio.Queue]
 
 
 class SimpleChatbot(Iterator[str]):
+    __slots__ = ("_questions", "_index")
+
     def __init__(self, questions: List[str]) -> None:
         self._questions = questions
         self._index = 0
@@ -18,9 +37,132 @@ class SimpleChatbot(Iterator[str]):
         return q
 
 
+@lru_cache(maxsize=32)
+def load_questions(path: str) -> Tuple[str, ...]:
+    """Pytania z pliku (po jednym w linii), wczytane raz i współdzielone."""
+    with open(path, encoding="utf-8") as f:
+        return tuple(line.strip() for line in f if line.strip())
+
+
+class AsyncChatbot(AsyncIterator[str]):
+    """Asynchroniczny odpowiednik SimpleChatbot.
+
+    Lista pytań nie jest kopiowana - tysiące sesji mogą dzielić jedną krotkę,
+    a każda trzyma tylko własny indeks.
+    """
+
+    __slots__ = ("_source", "_index")
+
+    def __init__(self, source: QuestionSource) -> None:
+        if isinstance(source, str):
+            raise TypeError("Podaj listę pytań albo użyj AsyncChatbot.from_file")
+        if isinstance(source, (Sequence, asyncio.Queue)):
+            self._source = source
+        elif hasattr(source, "__aiter__"):
+            self._source = source.__aiter__()
+        else:
+            self._source = iter(source)
+        self._index = 0
+
+    @classmethod
+    def from_file(cls, path: str) -> "AsyncChatbot":
+        return cls(load_questions(path))
+
+    def __aiter__(self) -> "AsyncChatbot":
+        return self
+
+    async def __anext__(self) -> str:
+        source = self._source
+        if isinstance(source, Sequence):
+            if self._index >= len(source):
+                raise StopAsyncIteration
+            q = source[self._index]
+        elif isinstance(source, asyncio.Queue):
+            q = await source.get()
+            if q is None:
+                raise StopAsyncIteration
+        elif hasattr(source, "__anext__"):
+            q = await source.__anext__()
+        else:
+            try:
+                q = next(source)
+            except StopIteration:
+                raise StopAsyncIteration from None
+        self._index += 1
+        return q
+
+
+class ChatSession:
+    __slots__ = ("session_id", "bot")
+
+    def __init__(self, session_id: Hashable, bot: AsyncChatbot) -> None:
+        self.session_id = session_id
+        self.bot = bot
+
+    @property
+    def turns(self) -> int:
+        return self.bot._index
+
+
+# answer(sesja, pytanie) -> odpowiedź użytkownika (np. z sieci zamiast input())
+AnswerFn = Callable[[ChatSession, str], Awaitable[str]]
+
+
+class SessionManager:
+    """Wiele rozmów naraz na jednej pętli asyncio - jedno zadanie na sesję."""
+
+    def __init__(self, answer: AnswerFn) -> None:
+        self._answer = answer
+        self._sessions: Dict[Hashable, ChatSession] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.completed = 0
+
+    def open(self, session_id: Hashable, source: QuestionSource) -> ChatSession:
+        if session_id in self._sessions:
+            raise ValueError(f"Sesja {session_id!r} już istnieje")
+        session = ChatSession(session_id, AsyncChatbot(source))
+        self._sessions[session_id] = session
+        task = asyncio.get_running_loop().create_task(self._run(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return session
+
+    async def _run(self, session: ChatSession) -> None:
+        try:
+            async for question in session.bot:
+                await self._answer(session, question)
+        finally:
+            del self._sessions[session.session_id]
+            self.completed += 1
+
+    async def join(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: Hashable) -> bool:
+        return session_id in self._sessions
+
+
 # Przykładowa sesja
 if __name__ == "__main__":
     bot = SimpleChatbot(["Jak się nazywasz?", "Ulubiony kolor?"])
     for question in bot:
         print(question)
         input("> ")
+
+    async def demo() -> None:
+        async def answer(session: ChatSession, question: str) -> str:
+            await asyncio.sleep(0)
+            print(f"[{session.session_id}] {question}")
+            return "ok"
+
+        questions = ("Jak się nazywasz?", "Ulubiony kolor?")
+        manager = SessionManager(answer)
+        for i in range(3):
+            manager.open(i, questions)
+        await manager.join()
+
+    asyncio.run(demo())
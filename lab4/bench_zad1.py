@@ -0,0 +1,95 @@
+"""Pomiar kosztu operacji Library z zad1.py dla rosnącego katalogu.
+
+Dla każdego rozmiaru buduje katalog (po ``--copies`` egzemplarzy na tytuł),
+a potem mierzy średni czas jednej operacji borrow/return i available_books.
+Przy indeksach czas borrow/return powinien być płaski od setek do milionów
+tytułów. Ostatnia kolumna to przepustowość ``--threads`` wątków pracujących
+na różnych tytułach jednocześnie:
+
+    python bench_zad1.py
+    python bench_zad1.py --sizes 100 10000 1000000 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from typing import List
+
+from zad1 import Book, Library
+
+
+def _build(size: int, copies: int) -> Library:
+    library = Library()
+    for i in range(size):
+        for _ in range(copies):
+            library.add_book(Book(f"Tytul {i}", f"Autor {i % 1000}"))
+    return library
+
+
+def _per_op_us(library: Library, titles: List[str]) -> float:
+    start = time.perf_counter()
+    for title in titles:
+        library.borrow_book(title)
+        library.return_book(title)
+    return (time.perf_counter() - start) / (2 * len(titles)) * 1e6
+
+
+def _threaded_ops_per_s(library: Library, titles: List[str], threads: int) -> float:
+    chunks = [titles[i::threads] for i in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(chunk: List[str]) -> None:
+        barrier.wait()
+        for title in chunk:
+            library.borrow_book(title)
+            library.return_book(title)
+
+    pool = [threading.Thread(target=worker, args=(c,)) for c in chunks]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    return 2 * len(titles) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000]
+    )
+    parser.add_argument("--copies", type=int, default=2)
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f"{'tytuly':>10} {'budowa s':>9} {'op us':>7} {'dostepne ms':>12} "
+        f"{'ops/s (' + str(args.threads) + ' w.)':>16}"
+    )
+    for size in args.sizes:
+        start = time.perf_counter()
+        library = _build(size, args.copies)
+        build_s = time.perf_counter() - start
+
+        titles = [f"Tytul {rng.randrange(size)}" for _ in range(args.ops)]
+        op_us = _per_op_us(library, titles)
+
+        start = time.perf_counter()
+        library.available_books()
+        available_ms = (time.perf_counter() - start) * 1000
+
+        ops_s = _threaded_ops_per_s(library, titles, args.threads)
+        print(
+            f"{size:>10} {build_s:>9.2f} {op_us:>7.2f} {available_ms:>12.2f} "
+            f"{ops_s:>16.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
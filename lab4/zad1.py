@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import List
+
+import threading
+from typing import Dict, List
 
 
 class Book:
@@ -20,32 +22,79 @@ class Book:
 
 
 class Library:
+    """Biblioteka z indeksami po tytule i autorze oraz wieloma egzemplarzami.
+
+    Dla każdego tytułu trzymane są osobno egzemplarze wolne i wypożyczone,
+    a zbiór dostępnych tytułów aktualizowany jest przy każdej operacji -
+    koszt ``borrow_book`` / ``return_book`` nie zależy od wielkości katalogu.
+    Operacje na różnych tytułach nie czekają na siebie: każdy tytuł chroni
+    jeden z ``lock_stripes`` zamków (zamiast jednego globalnego).
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, lock_stripes: int = 64) -> None:
         self._books: List[Book] = []
+        self._by_title: Dict[str, List[Book]] = {}
+        self._by_author: Dict[str, List[Book]] = {}
+        self._free: Dict[str, List[Book]] = {}
+        self._lent: Dict[str, List[Book]] = {}
+        # Słownik jako zbiór zachowujący kolejność udostępnienia tytułów
+        self._available: Dict[str, None] = {}
+        self._locks = [threading.Lock() for _ in range(max(lock_stripes, 1))]
+        self._index_lock = threading.Lock()
+
+    def _lock_for(self, title: str) -> threading.Lock:
+        return self._locks[hash(title) % len(self._locks)]
 
     # Public API
     def add_book(self, book: Book) -> None:
-        self._books.append(book)
+        with self._index_lock:
+            self._books.append(book)
+            self._by_author.setdefault(book.author, []).append(book)
+        with self._lock_for(book.title):
+            self._by_title.setdefault(book.title, []).append(book)
+            if book.is_available():
+                self._free.setdefault(book.title, []).append(book)
+                self._available[book.title] = None
+            else:
+                self._lent.setdefault(book.title, []).append(book)
 
     def borrow_book(self, title: str) -> str:
-        for book in self._books:
-            if book.title == title:
-                if book.is_available():
-                    book.available = False
-                    return f"Wypozyczono: {title}"
+        with self._lock_for(title):
+            if title not in self._by_title:
+                return f"Brak ksiazki: {title}"
+            free = self._free.get(title)
+            if not free:
                 return f"Ksiazka {title} niedostepna"
-        return f"Brak ksiazki: {title}"
+            book = free.pop()
+            book.available = False
+            self._lent.setdefault(title, []).append(book)
+            if not free:
+                self._available.pop(title, None)
+            return f"Wypozyczono: {title}"
 
     def return_book(self, title: str) -> str:
-        for book in self._books:
-            if book.title == title:
+        with self._lock_for(title):
+            if title not in self._by_title:
+                return f"Nie nalezy do biblioteki: {title}"
+            lent = self._lent.get(title)
+            if lent:
+                book = lent.pop()
                 book.available = True
-                return f"Zwrocono: {title}"
-        return f"Nie nalezy do biblioteki: {title}"
+                self._free.setdefault(title, []).append(book)
+                self._available[title] = None
+            return f"Zwrocono: {title}"
 
     def available_books(self) -> list[str]:
-        return [book.title for book in self._books if book.is_available()]
+        # list(dict) kopiuje klucze w jednym kroku pod GIL
+        return list(self._available)
+
+    def books_by_author(self, author: str) -> list[Book]:
+        return list(self._by_author.get(author, ()))
+
+    def copies(self, title: str) -> tuple[int, int]:
+        """(wolne, wszystkie) egzemplarze danego tytułu."""
+        with self._lock_for(title):
+            return len(self._free.get(title, ())), len(self._by_title.get(title, ()))
 
 
 # Demo
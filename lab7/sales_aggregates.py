@@ -0,0 +1,205 @@
+"""Tabele sum sprzedaży utrzymywane przyrostowo przez triggery na ``sales``.
+
+* ``sales_by_product``     - wartość i liczba sztuk per produkt,
+* ``sales_by_day``         - wartość i liczba sztuk per dzień,
+* ``sales_by_product_day`` - to samo per (produkt, dzień), dla filtrów.
+
+Każdy INSERT / UPDATE / DELETE na ``sales`` poprawia tylko swoje grupy, więc
+raporty czytają tyle wierszy, ile jest grup, a nie całą historię.
+``install`` zakłada tabele i triggery (przy pierwszym razie liczy sumy od
+zera); ``rebuild`` przelicza je ponownie, ``verify`` porównuje z ``sales``:
+
+    python sales_aggregates.py verify --db sales.db
+    python sales_aggregates.py rebuild --db sales.db
+"""
+
+import argparse
+import pathlib
+import sqlite3
+import sys
+from typing import Dict, List, Tuple
+
+SOURCE = "sales"
+
+# tabela -> kolumny klucza grupy
+AGGREGATES: Dict[str, Tuple[str, ...]] = {
+    "sales_by_product": ("product",),
+    "sales_by_day": ("date",),
+    "sales_by_product_day": ("product", "date"),
+}
+
+TRIGGERS = ("sales_agg_insert", "sales_agg_delete", "sales_agg_update")
+
+# Tolerancja przy porównaniu sum wartości (REAL sumowany przyrostowo)
+_TOLERANCE = 1e-6
+
+
+def _create_tables(conn: sqlite3.Connection) -> None:
+    for table, keys in AGGREGATES.items():
+        columns = ", ".join(f"{k} TEXT NOT NULL" for k in keys)
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                {columns},
+                total_value REAL NOT NULL,
+                total_quantity INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                PRIMARY KEY ({", ".join(keys)})
+            ) WITHOUT ROWID
+            """
+        )
+
+
+def _add(table: str, keys: Tuple[str, ...], row: str) -> str:
+    names = ", ".join(keys)
+    values = ", ".join(f"{row}.{k}" for k in keys)
+    return f"""
+        INSERT INTO {table} ({names}, total_value, total_quantity, row_count)
+        VALUES ({values}, {row}.price * {row}.quantity, {row}.quantity, 1)
+        ON CONFLICT ({names}) DO UPDATE SET
+            total_value = total_value + excluded.total_value,
+            total_quantity = total_quantity + excluded.total_quantity,
+            row_count = row_count + 1;
+    """
+
+
+def _subtract(table: str, keys: Tuple[str, ...], row: str) -> str:
+    match = " AND ".join(f"{k} = {row}.{k}" for k in keys)
+    return f"""
+        UPDATE {table} SET
+            total_value = total_value - {row}.price * {row}.quantity,
+            total_quantity = total_quantity - {row}.quantity,
+            row_count = row_count - 1
+        WHERE {match};
+        DELETE FROM {table} WHERE {match} AND row_count <= 0;
+    """
+
+
+def _create_triggers(conn: sqlite3.Connection) -> None:
+    added = "".join(_add(t, k, "NEW") for t, k in AGGREGATES.items())
+    removed = "".join(_subtract(t, k, "OLD") for t, k in AGGREGATES.items())
+    conn.execute(
+        f"CREATE TRIGGER sales_agg_insert AFTER INSERT ON {SOURCE} "
+        f"BEGIN {added} END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER sales_agg_delete AFTER DELETE ON {SOURCE} "
+        f"BEGIN {removed} END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER sales_agg_update "
+        f"AFTER UPDATE OF product, quantity, price, date ON {SOURCE} "
+        f"BEGIN {removed} {added} END"
+    )
+
+
+def _installed(conn: sqlite3.Connection) -> bool:
+    found = conn.execute(
+        f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+        f"AND name IN ({', '.join('?' * len(TRIGGERS))})",
+        TRIGGERS,
+    ).fetchone()[0]
+    return found == len(TRIGGERS)
+
+
+def _fill(conn: sqlite3.Connection) -> None:
+    for table, keys in AGGREGATES.items():
+        names = ", ".join(keys)
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            f"""
+            INSERT INTO {table} ({names}, total_value, total_quantity, row_count)
+            SELECT {names}, SUM(price * quantity), SUM(quantity), COUNT(*)
+            FROM {SOURCE}
+            GROUP BY {names}
+            """
+        )
+
+
+def install(conn: sqlite3.Connection) -> None:
+    """Zakłada tabele sum i triggery; sumy liczone od zera tylko za 1. razem.
+
+    Tabela ``sales`` musi już istnieć. Wszystko dzieje się w jednej
+    transakcji, więc żaden wiersz dopisany w międzyczasie nie zostanie pominięty.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    if _installed(conn):
+        return
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if not _installed(conn):
+            _create_tables(conn)
+            for name in TRIGGERS:
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            _create_triggers(conn)
+            _fill(conn)
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Przelicza wszystkie sumy od nowa (np. po ręcznej zmianie tabel)."""
+    install(conn)
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        _fill(conn)
+
+
+def verify(conn: sqlite3.Connection) -> List[str]:
+    """Różnice między tabelami sum a pełnym przeliczeniem ``sales``.
+
+    Pusta lista oznacza zgodność. Wymaga pełnego skanu ``sales``.
+    """
+    if not _installed(conn):
+        return ["tabele sum nie są zainstalowane (python sales_aggregates.py install)"]
+    problems = []
+    for table, keys in AGGREGATES.items():
+        names = ", ".join(keys)
+        expected = {
+            row[:-3]: row[-3:]
+            for row in conn.execute(
+                f"SELECT {names}, SUM(price * quantity), SUM(quantity), COUNT(*) "
+                f"FROM {SOURCE} GROUP BY {names}"
+            )
+        }
+        actual = {
+            row[:-3]: row[-3:]
+            for row in conn.execute(
+                f"SELECT {names}, total_value, total_quantity, row_count FROM {table}"
+            )
+        }
+        for key in expected.keys() | actual.keys():
+            want, got = expected.get(key), actual.get(key)
+            if (
+                want is None
+                or got is None
+                or want[1:] != got[1:]
+                or abs(want[0] - got[0]) > _TOLERANCE * max(1.0, abs(want[0]))
+            ):
+                problems.append(f"{table} {key}: oczekiwano {want}, jest {got}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tabele sum sprzedaży")
+    parser.add_argument("command", choices=("install", "rebuild", "verify"))
+    parser.add_argument(
+        "--db", type=pathlib.Path, default=pathlib.Path(__file__).with_name("sales.db")
+    )
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.command == "verify":
+            problems = verify(conn)
+            for problem in problems:
+                print(problem)
+            print("OK" if not problems else f"{len(problems)} różnic")
+            sys.exit(1 if problems else 0)
+        {"install": install, "rebuild": rebuild}[args.command](conn)
+        print("OK")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,258 @@
-import sqlite3, pathlib, sys
+import argparse, pathlib, random, re, sqlite3, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
 import pandas as pd
 
+import sales_aggregates
+
 # Konfiguracja
 db_path = pathlib.Path(__file__).with_name(
     "sales.db"
 )
 table_name = "sales"
 
-conn = sqlite3.connect(db_path)
-cur = conn.cursor()
+CHUNK_SIZE = 100_000  # wiersze na jeden DataFrame przy strumieniowaniu
+PREVIEW_ROWS = 10  # ile wierszy raportu wypisać na ekran
 
-# Walidacja: czy tabela istnieje?
-cur.execute(
-    "SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (table_name,)
-)
-if not cur.fetchone():
-    sys.exit(f"BŁĄD: tabela '{table_name}' nie istnieje w {db_path.resolve()}")
-
-queries = {
-    "a) Sprzedaż produktu 'Laptop'": f"SELECT * FROM {table_name} WHERE product = 'Laptop';",
-    "b) Sprzedaż z 2025-05-07 i 2025-05-08": f"SELECT * FROM {table_name} WHERE date IN ('2025-05-07','2025-05-08');",
-    "c) Cena jednostkowa > 200 zł": f"SELECT * FROM {table_name} WHERE price > 200;",
-    "d) Łączna wartość sprzedaży per produkt": f"""
+
+class Report(NamedTuple):
+    label: str
+    sql: str  # {table} - nazwa tabeli, wartości wyłącznie jako parametry "?"
+    params: Tuple = ()
+
+
+class ReportResult(NamedTuple):
+    label: str
+    rows: int
+    preview: pd.DataFrame
+    seconds: float
+
+
+reports = (
+    Report(
+        "a) Sprzedaż produktu 'Laptop'",
+        "SELECT * FROM {table} WHERE product = ?",
+        ("Laptop",),
+    ),
+    Report(
+        "b) Sprzedaż z 2025-05-07 i 2025-05-08",
+        "SELECT * FROM {table} WHERE date IN (?, ?)",
+        ("2025-05-07", "2025-05-08"),
+    ),
+    Report(
+        "c) Cena jednostkowa > 200 zł",
+        "SELECT * FROM {table} WHERE price > ?",
+        (200,),
+    ),
+    Report(
+        "d) Łączna wartość sprzedaży per produkt",
+        """
         SELECT product,
-               SUM(price * quantity) AS total_sales_value
-        FROM {table_name}
-        GROUP BY product
-        ORDER BY total_sales_value DESC;
+               total_value AS total_sales_value
+        FROM sales_by_product
+        ORDER BY total_sales_value DESC
         """,
-    "e) Dzień z największą liczbą sprzedanych sztuk": f"""
+    ),
+    Report(
+        "e) Dzień z największą liczbą sprzedanych sztuk",
+        """
         SELECT date,
-               SUM(quantity) AS total_units_sold
-        FROM {table_name}
-        GROUP BY date
+               total_quantity AS total_units_sold
+        FROM sales_by_day
         ORDER BY total_units_sold DESC
-        LIMIT 1;
+        LIMIT 1
         """,
+    ),
+)
+
+# Indeksy pod filtry raportów (a)-(c); (d) i (e) czytają gotowe sumy
+# z tabel utrzymywanych przez triggery (sales_aggregates.py), O(liczba grup)
+indexes = {
+    "idx_{table}_product": "(product)",
+    "idx_{table}_date": "(date)",
+    "idx_{table}_price": "(price)",
 }
 
 
-for label, sql in queries.items():
-    df = pd.read_sql_query(sql, conn)
-    print(f"\n=== {label} ===")
-    print(df.to_string(index=False))
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _sql(report: Report, table: str) -> str:
+    return report.sql.format(table=_quote(table))
+
+
+def connect_ro(path: pathlib.Path) -> sqlite3.Connection:
+    """Połączenie tylko do odczytu - można ich otworzyć wiele naraz."""
+    conn = sqlite3.connect(
+        f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+    )
+    conn.execute("PRAGMA mmap_size = 268435456")
+    return conn
+
+
+def ensure_indexes(conn: sqlite3.Connection, table: str) -> None:
+    for name, columns in indexes.items():
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(name.format(table=table))} "
+            f"ON {_quote(table)} {columns}"
+        )
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+
+
+def query_plan(conn: sqlite3.Connection, report: Report, table: str) -> List[str]:
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {_sql(report, table)}", report.params)
+    return [row[-1] for row in rows]
+
+
+def full_scans(
+    conn: sqlite3.Connection, table: str, items: Sequence[Report] = reports
+) -> Dict[str, List[str]]:
+    """Raporty, których plan przechodzi całą tabelę -> ich plan."""
+    # "SCAN sales" bez "USING ... INDEX" oznacza przejście całej tabeli
+    full_scan = re.compile(rf"SCAN (TABLE )?{re.escape(table)}( AS \S+)?")
+    bad = {}
+    for report in items:
+        plan = query_plan(conn, report, table)
+        if any(full_scan.fullmatch(step) for step in plan):
+            bad[report.label] = plan
+    return bad
+
+
+def run_report(
+    path: pathlib.Path,
+    report: Report,
+    table: str = table_name,
+    chunksize: int = CHUNK_SIZE,
+    sink: Optional[Callable[[str, pd.DataFrame], None]] = None,
+) -> ReportResult:
+    """Wykonuje raport kawałkami po ``chunksize`` wierszy.
+
+    Każdy kawałek trafia do ``sink`` (np. zapis do CSV); w pamięci zostaje
+    tylko podgląd pierwszych PREVIEW_ROWS wierszy i licznik.
+    """
+    start = time.perf_counter()
+    conn = connect_ro(path)
+    rows, preview = 0, None
+    try:
+        chunks = pd.read_sql_query(
+            _sql(report, table), conn, params=report.params, chunksize=chunksize
+        )
+        for chunk in chunks:
+            rows += len(chunk)
+            if preview is None:
+                preview = chunk.head(PREVIEW_ROWS)
+            elif len(preview) < PREVIEW_ROWS:
+                missing = PREVIEW_ROWS - len(preview)
+                preview = pd.concat([preview, chunk.head(missing)])
+            if sink is not None:
+                sink(report.label, chunk)
+    finally:
+        conn.close()
+    if preview is None:
+        preview = pd.DataFrame()
+    return ReportResult(report.label, rows, preview, time.perf_counter() - start)
+
+
+def run_reports(
+    path: pathlib.Path,
+    table: str = table_name,
+    items: Sequence[Report] = reports,
+    workers: int = 4,
+    chunksize: int = CHUNK_SIZE,
+) -> List[ReportResult]:
+    """Raporty równolegle, każdy na własnym połączeniu tylko do odczytu."""
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = [
+            pool.submit(run_report, path, report, table, chunksize) for report in items
+        ]
+        return [f.result() for f in futures]
+
+
+def generate(path: pathlib.Path, rows: int, seed: int = 0) -> None:
+    """Dopisuje ``rows`` losowych sprzedaży - baza testowa do pomiarów."""
+    rng = random.Random(seed)
+    products = ["Laptop", "Telefon", "Monitor", "Myszka", "Klawiatura"] + [
+        f"Produkt {i}" for i in range(195)
+    ]
+    start = date(2023, 1, 1)
+    days = [(start + timedelta(days=i)).isoformat() for i in range(3 * 365)]
+    conn = sqlite3.connect(path)
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {_quote(table_name)} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            price REAL NOT NULL,
+            date TEXT NOT NULL
+        )
+        """
+    )
+    insert = (
+        f"INSERT INTO {_quote(table_name)} (product, quantity, price, date) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    with conn:
+        for done in range(0, rows, CHUNK_SIZE):
+            batch = [
+                (
+                    rng.choice(products),
+                    rng.randint(1, 10),
+                    round(rng.uniform(5, 5000), 2),
+                    rng.choice(days),
+                )
+                for _ in range(min(CHUNK_SIZE, rows - done))
+            ]
+            conn.executemany(insert, batch)
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Raporty sprzedaży z bazy SQLite")
+    parser.add_argument("--db", type=pathlib.Path, default=db_path)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument(
+        "--generate", type=int, metavar="N", help="najpierw dopisz N losowych wierszy"
+    )
+    args = parser.parse_args()
+
+    if args.generate:
+        generate(args.db, args.generate)
+
+    conn = sqlite3.connect(args.db)
+    cur = conn.cursor()
+
+    # Walidacja: czy tabela istnieje?
+    cur.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (table_name,)
+    )
+    if not cur.fetchone():
+        sys.exit(f"BŁĄD: tabela '{table_name}' nie istnieje w {args.db.resolve()}")
+
+    ensure_indexes(conn, table_name)
+    sales_aggregates.install(conn)
+    bad = full_scans(conn, table_name)
+    conn.close()
+    if bad:
+        details = "; ".join(f"{label}: {plan}" for label, plan in bad.items())
+        sys.exit(f"BŁĄD: raporty bez indeksu (pełny skan tabeli): {details}")
+
+    results = run_reports(args.db, workers=args.workers, chunksize=args.chunksize)
+    for result in results:
+        print(f"\n=== {result.label} ===")
+        print(result.preview.to_string(index=False))
+        if result.rows > len(result.preview):
+            print(f"... ({result.rows} wierszy)")
+
+    print("\n=== Czasy raportów ===")
+    for result in results:
+        print(f"{result.seconds:8.3f} s  {result.rows:>10} wierszy  {result.label}")
+
 
-conn.close()
+if __name__ == "__main__":
+    main()
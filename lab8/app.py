@@ -5,36 +5,120 @@ Streamlit app for managing and visualising sales stored in an SQLite database
 """
 
 import os
+import pathlib
 import sqlite3
+import threading
+import time
 from datetime import date as dt_date
 
 import pandas as pd
 import streamlit as st
 import altair as alt
 
+import sales_aggregates
+
 DB_PATH = os.getenv("SALES_DB", "sales.db")
+IMPORT_BATCH_SIZE = 10_000
+
+INSERT_SQL = "INSERT INTO sales (product, quantity, price, date) VALUES (?,?,?,?)"
 
 # Database helpers
 
-def get_connection():
-    # Cache the connection so every rerun re‑uses the same handle.
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+
+def connect(path: str, readonly: bool = False) -> sqlite3.Connection:
+    """Open *path* in WAL mode: readers don't block the writer and vice versa.
+
+    A *readonly* connection only ever sees committed transactions, so it never
+    shows rows of an import that is still running on the writer.
+    """
+    if readonly:
+        uri = f"{pathlib.Path(path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=10)
+    else:
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        conn.execute("PRAGMA journal_mode = WAL")
+        # Durable at checkpoints only – safe with WAL, much cheaper commits
+        conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -65536")  # 64 MiB
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+@st.cache_resource(show_spinner=False)
+def get_connection() -> sqlite3.Connection:
+    # Cache the connection so every rerun re‑uses the same handle. Writes only:
+    # reads on it would see an import's uncommitted batches.
+    return connect(DB_PATH)
+
+
+@st.cache_resource(show_spinner=False)
+def write_lock() -> threading.Lock:
+    # One writer at a time on the shared connection (sessions run in threads)
+    return threading.Lock()
+
+
+@st.cache_resource(show_spinner=False)
+def get_reader() -> sqlite3.Connection:
+    # Read-only connection shared by the chart queries (created after init_db)
+    return connect(DB_PATH, readonly=True)
+
+
+@st.cache_resource(show_spinner=False)
+def read_lock() -> threading.Lock:
+    # sqlite3 connections must not run statements from two threads at once
+    return threading.Lock()
 
 
 def init_db():
     conn = get_connection()
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS sales (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product TEXT NOT NULL,
-            quantity INTEGER NOT NULL,
-            price REAL NOT NULL,
-            date TEXT NOT NULL
+    with write_lock():
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sales (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                product TEXT NOT NULL,
+                quantity INTEGER NOT NULL,
+                price REAL NOT NULL,
+                date TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        # Per-product / per-day totals kept up to date by triggers on *sales*
+        sales_aggregates.install(conn)
+        install_change_counter(conn)
+
+
+def install_change_counter(conn: sqlite3.Connection) -> None:
+    """Count the changes an id watermark cannot see.
+
+    Triggers bump *sales_changes.version* on every UPDATE and DELETE, and on
+    an INSERT below the highest id handed out so far; plain appends leave it
+    alone. SalesFrame reloads whenever the counter moves.
+    """
+    bump = "UPDATE sales_changes SET version = version + 1;"
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sales_changes ("
+            "id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)"
+        )
+        conn.execute("INSERT OR IGNORE INTO sales_changes VALUES (1, 0)")
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS sales_changes_update "
+            f"AFTER UPDATE ON sales BEGIN {bump} END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS sales_changes_delete "
+            f"AFTER DELETE ON sales BEGIN {bump} END"
+        )
+        # AUTOINCREMENT has already raised the sequence to NEW.id, so only an
+        # explicit id below an earlier one compares lower
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS sales_changes_insert "
+            "AFTER INSERT ON sales WHEN NEW.id < "
+            "(SELECT seq FROM sqlite_sequence WHERE name = 'sales') "
+            f"BEGIN {bump} END"
         )
-        """
-    )
-    conn.commit()
 
 
 # Initialise the database exactly once (runs on every first execution after
@@ -43,25 +127,181 @@ init_db()
 
 # Data access layer
 
-@st.cache_data(show_spinner=False)
+COLUMNS = ["id", "product", "quantity", "price", "date"]
+
+
+class SalesFrame:
+    """The *sales* table as a DataFrame, extended with rows above the last id.
+
+    Uses its own read-only connection: ``PRAGMA data_version`` only changes
+    when *other* connections commit, so an unchanged value means nothing needs
+    to be read.
+    New rows are fetched by ``id > watermark``. Updates, deletes and inserts
+    below the watermark bump the *sales_changes* counter (see
+    ``install_change_counter``); those, and schema changes, fall back to a
+    full reload.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._conn = connect(path, readonly=True)
+        self._lock = threading.Lock()
+        self.frame = pd.DataFrame(columns=COLUMNS)
+        self._watermark = 0
+        self._changes = None
+        self._data_version = None
+        self._schema_version = None
+
+    def _pragma(self, name: str) -> int:
+        return self._conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def _change_count(self) -> int:
+        return self._conn.execute("SELECT version FROM sales_changes").fetchone()[0]
+
+    def _read(self, after: int) -> pd.DataFrame:
+        return pd.read_sql_query(
+            "SELECT * FROM sales WHERE id > ? ORDER BY id", self._conn, params=(after,)
+        )
+
+    def _reload(self) -> None:
+        self.frame = self._read(0)
+        self._watermark = int(self.frame["id"].max()) if not self.frame.empty else 0
+
+    def _append(self) -> None:
+        new = self._read(self._watermark)
+        if new.empty:
+            return
+        frames = [self.frame, new] if not self.frame.empty else [new]
+        self.frame = pd.concat(frames, ignore_index=True)
+        self._watermark = int(new["id"].max())
+
+    def refresh(self) -> pd.DataFrame:
+        """Current table contents; the returned frame must not be modified."""
+        with self._lock:
+            # Read the version first so a commit during the fetch is seen next time
+            data_version = self._pragma("data_version")
+            if data_version == self._data_version:
+                return self.frame
+            schema_version = self._pragma("schema_version")
+            # Read before the rows: a change committed in between moves the
+            # counter again and is reloaded on the next call
+            changes = self._change_count()
+            if schema_version != self._schema_version or changes != self._changes:
+                self._reload()
+            else:
+                self._append()
+            self._data_version = data_version
+            self._schema_version = schema_version
+            self._changes = changes
+            return self.frame
+
+
+@st.cache_resource(show_spinner=False)
+def sales_frame() -> SalesFrame:
+    return SalesFrame(DB_PATH)
+
+
 def load_data() -> pd.DataFrame:
     """Load the *sales* table into a DataFrame. Returns empty DF if missing."""
-    conn = get_connection()
     try:
-        return pd.read_sql_query("SELECT * FROM sales", conn)
+        return sales_frame().refresh()
     except (sqlite3.OperationalError, pd.io.sql.DatabaseError):
         # Table was dropped between reruns – recreate and return empty DF
         init_db()
-        return pd.DataFrame(columns=["id", "product", "quantity", "price", "date"])
+        return pd.DataFrame(columns=COLUMNS)
+
+
+def load_daily_totals(product: str = "") -> pd.DataFrame:
+    """Daily sales value read from the aggregate tables (one row per day)."""
+    with read_lock():
+        if product:
+            return pd.read_sql_query(
+                "SELECT date, total_value AS value FROM sales_by_product_day "
+                "WHERE product = ? ORDER BY date",
+                get_reader(),
+                params=(product,),
+            )
+        return pd.read_sql_query(
+            "SELECT date, total_value AS value FROM sales_by_day ORDER BY date",
+            get_reader(),
+        )
+
+
+def load_product_totals(product: str = "") -> pd.DataFrame:
+    """Total quantity per product read from the aggregate tables."""
+    sql = "SELECT product, total_quantity AS quantity FROM sales_by_product"
+    params: tuple = ()
+    if product:
+        sql += " WHERE product = ?"
+        params = (product,)
+    with read_lock():
+        return pd.read_sql_query(
+            sql + " ORDER BY quantity DESC", get_reader(), params=params
+        )
 
 
 def insert_sale(product: str, quantity: int, price: float, sale_date: dt_date):
     conn = get_connection()
-    conn.execute(
-        "INSERT INTO sales (product, quantity, price, date) VALUES (?,?,?,?)",
-        (product, quantity, price, sale_date.isoformat()),
+    with write_lock(), conn:
+        conn.execute(INSERT_SQL, (product, quantity, price, sale_date.isoformat()))
+
+
+def read_upload(upload) -> pd.DataFrame:
+    """Read an uploaded CSV or Parquet file into a DataFrame."""
+    if upload.name.lower().endswith(".parquet"):
+        return pd.read_parquet(upload)
+    return pd.read_csv(upload)
+
+
+def prepare_import(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalise upload columns to *sales* rows; raises ValueError if invalid."""
+    missing = [c for c in COLUMNS[1:] if c not in df.columns]
+    if missing:
+        raise ValueError(f"Brak kolumn: {', '.join(missing)}")
+    rows = df[COLUMNS[1:]].copy()
+    rows["product"] = rows["product"].astype("string").str.strip()
+    rows["quantity"] = pd.to_numeric(rows["quantity"], errors="coerce")
+    rows["price"] = pd.to_numeric(rows["price"], errors="coerce")
+    rows["date"] = pd.to_datetime(rows["date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    invalid = (
+        rows.isna().any(axis=1)
+        | (rows["product"] == "")
+        | (rows["quantity"] < 1)
+        | (rows["quantity"] % 1 != 0)
+        | (rows["price"] <= 0)
     )
-    conn.commit()
+    if invalid.any():
+        raise ValueError(
+            f"Niepoprawne wiersze: {int(invalid.sum())} "
+            "(wymagane: produkt, ilość ≥ 1, cena > 0, data)"
+        )
+    rows["quantity"] = rows["quantity"].astype("int64")
+    rows["price"] = rows["price"].astype("float64")
+    return rows
+
+
+def import_sales(rows: pd.DataFrame, on_progress=None) -> int:
+    """Insert *rows* in batches of IMPORT_BATCH_SIZE inside one transaction.
+
+    ``on_progress(done, total)`` is called after every batch. Returns the
+    number of inserted rows; on error nothing is inserted.
+    """
+    conn = get_connection()
+    total = len(rows)
+    with write_lock(), conn:
+        for start in range(0, total, IMPORT_BATCH_SIZE):
+            batch = rows.iloc[start : start + IMPORT_BATCH_SIZE]
+            conn.executemany(
+                INSERT_SQL,
+                (
+                    (product, int(quantity), float(price), day)
+                    for product, quantity, price, day in batch.itertuples(
+                        index=False, name=None
+                    )
+                ),
+            )
+            if on_progress is not None:
+                on_progress(min(start + IMPORT_BATCH_SIZE, total), total)
+    return total
 
 
 # Sidebar –  input form
@@ -84,11 +324,46 @@ with st.sidebar.form(key="add_sale_form"):
             )
             st.success("Zapisano nową sprzedaż!")
             st.balloons()
-            # Clear cache to reload data on next rerun
-            load_data.clear()
+            # No cache to clear: load_data() picks up the new row by its id
         else:
             st.error("Wprowadź poprawne dane (produkt, cena > 0)")
 
+# Sidebar – bulk import
+
+st.sidebar.header("Import z pliku 📥")
+upload = st.sidebar.file_uploader(
+    "CSV lub Parquet (kolumny: product, quantity, price, date)",
+    type=["csv", "parquet"],
+)
+if upload is not None and st.sidebar.button("Importuj"):
+    try:
+        import_rows = prepare_import(read_upload(upload))
+    except (ValueError, ImportError, pd.errors.ParserError) as exc:
+        st.sidebar.error(f"Nie można zaimportować pliku: {exc}")
+    else:
+        progress = st.sidebar.progress(0.0)
+        counter = st.sidebar.empty()
+        import_start = time.perf_counter()
+
+        def show_progress(done: int, total: int) -> None:
+            elapsed = time.perf_counter() - import_start
+            progress.progress(done / total)
+            counter.text(
+                f"{done:,} / {total:,} wierszy · {elapsed:.1f} s · "
+                f"{done / max(elapsed, 1e-9):,.0f} wierszy/s"
+            )
+
+        try:
+            imported = import_sales(import_rows, show_progress)
+        except sqlite3.Error as exc:
+            st.sidebar.error(f"Import przerwany, nic nie zapisano: {exc}")
+        else:
+            elapsed = time.perf_counter() - import_start
+            st.sidebar.success(
+                f"Zaimportowano {imported:,} wierszy w {elapsed:.1f} s "
+                f"({imported / max(elapsed, 1e-9):,.0f} wierszy/s)"
+            )
+
 # Main layout
 
 st.title("📊 Panel sprzedaży")
@@ -98,7 +373,7 @@ try:
     sales_df = load_data()
 except Exception as exc:
     st.error(f"Nie udało się wczytać danych: {exc}")
-    sales_df = pd.DataFrame(columns=["id", "product", "quantity", "price", "date"])
+    sales_df = pd.DataFrame(columns=COLUMNS)
 
 # Filters
 with st.expander("Filtry", expanded=False):
@@ -122,21 +397,13 @@ if show_table:
         use_container_width=True,
     )
 
-# Charts
-
-
-def add_value_column(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["value"] = df["quantity"] * df["price"]
-    return df
-
-
-chart_df = add_value_column(filtered_df) if not filtered_df.empty else filtered_df
+# Charts – read from the aggregate tables, so their cost does not grow with
+# the number of sales rows
 
 # Daily sales value
 st.subheader("Sprzedaż dzienna (wartość)")
-if not chart_df.empty:
-    daily = chart_df.groupby("date", as_index=False)["value"].sum().sort_values("date")
+daily = load_daily_totals(selected_product)
+if not daily.empty:
     daily_chart = (
         alt.Chart(daily)
         .mark_bar()
@@ -149,12 +416,8 @@ else:
 
 # Total quantity by product
 st.subheader("Łączna ilość sprzedanych produktów")
-if not chart_df.empty:
-    by_product = (
-        chart_df.groupby("product", as_index=False)["quantity"]
-        .sum()
-        .sort_values("quantity", ascending=False)
-    )
+by_product = load_product_totals(selected_product)
+if not by_product.empty:
     product_chart = (
         alt.Chart(by_product)
         .mark_bar()
@@ -0,0 +1,215 @@
+"""Compare inference profiles (fp32 vs int8) for the lab9 models on CPU.
+
+Each profile runs in a fresh process so memory is measured in isolation.
+Reports single-request latency, batched throughput, peak RSS, steady-state
+RSS after the run (Linux only), serialized weight size and drift of the
+outputs against the fp32 run on a fixed sample set:
+
+    python benchmark_inference.py spam
+    python benchmark_inference.py summary --repeat 2 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import multiprocessing as mp
+import os
+import resource
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+SPAM_MODEL = os.getenv(
+    "HF_SPAM_MODEL", "mrm8488/bert-tiny-finetuned-enron-spam-detection"
+)
+SUMMARY_MODEL = os.getenv("HF_SUMMARY_MODEL", "facebook/bart-large-cnn")
+
+SPAM_SAMPLES = [
+    "Congratulations! You won a FREE lottery! Click here to claim now.",
+    "Cześć Kasiu, przesyłam notatki ze spotkania w załączniku.",
+    "URGENT: your account has been suspended, verify your password at this link.",
+    "Hi team, the quarterly report is due on Friday, please send your sections.",
+    "Cheap meds online!!! No prescription needed, lowest prices guaranteed.",
+    "Przypominam o jutrzejszym spotkaniu o 10:00 w sali 204.",
+    "You have been selected for an exclusive offer - reply with your bank details.",
+    "Thanks for the review, I pushed the fixes to the branch this morning.",
+] * 4
+
+SUMMARY_SAMPLES = [
+    "The city council approved a new public transport plan on Tuesday. The plan "
+    "adds three tram lines, extends night bus service and introduces a single "
+    "ticket valid across all operators. Officials expect ridership to grow by a "
+    "fifth within two years, while critics warn that the budget relies on "
+    "optimistic forecasts of fare revenue and federal grants.",
+    "Researchers reported a new battery chemistry that retains ninety percent of "
+    "its capacity after five thousand charge cycles. The cells use a sodium-based "
+    "cathode and avoid cobalt entirely, which could cut production costs. The "
+    "team cautioned that energy density is still lower than lithium-ion and that "
+    "scaling manufacturing will take several years.",
+    "The national football team secured qualification for the tournament after a "
+    "two-one win in the final group match. The winning goal came in the last "
+    "minute from a substitute making his debut. The coach praised the squad's "
+    "resilience but said defensive errors must be fixed before the finals.",
+    "A heatwave across southern Europe pushed temperatures above forty degrees "
+    "for the fifth consecutive day. Authorities issued health warnings, opened "
+    "cooling centres and restricted outdoor work during afternoon hours. Farmers "
+    "reported crop losses and wildfires forced the evacuation of several villages.",
+]
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _current_rss_mb() -> Optional[float]:
+    gc.collect()
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:  # no procfs (e.g. macOS)
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _state_dict_mb(model: Any) -> float:
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def _time_calls(fn, items: List[Any], repeat: int) -> List[float]:
+    fn(items[:1])  # warm-up
+    latencies = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            fn([item])
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _bench(task: str, profile: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Body of a child process: load one model in one profile and measure it."""
+
+    import torch
+    from transformers import (
+        AutoModelForSeq2SeqLM,
+        AutoModelForSequenceClassification,
+        AutoTokenizer,
+    )
+
+    from inference_profile import apply_profile, configure_threads
+
+    configure_threads(args.threads, args.interop_threads)
+
+    def encode(texts: List[str]) -> Any:
+        return tokenizer(texts, truncation=True, padding="longest", return_tensors="pt")
+
+    start = time.perf_counter()
+    if task == "spam":
+        tokenizer = AutoTokenizer.from_pretrained(SPAM_MODEL)
+        model = AutoModelForSequenceClassification.from_pretrained(SPAM_MODEL)
+        samples: List[str] = SPAM_SAMPLES
+
+        def run(texts: List[str]) -> List[List[float]]:
+            with torch.no_grad():
+                return torch.softmax(model(**encode(texts)).logits, dim=-1).tolist()
+
+    else:
+        tokenizer = AutoTokenizer.from_pretrained(SUMMARY_MODEL)
+        model = AutoModelForSeq2SeqLM.from_pretrained(SUMMARY_MODEL)
+        samples = SUMMARY_SAMPLES
+
+        def run(texts: List[str]) -> List[str]:
+            with torch.no_grad():
+                ids = model.generate(
+                    **encode(texts), max_length=80, min_length=20, num_beams=4
+                )
+            return tokenizer.batch_decode(ids, skip_special_tokens=True)
+
+    model = apply_profile(model, profile)
+    model.eval()
+    load_s = time.perf_counter() - start
+
+    latencies = _time_calls(run, samples, args.repeat)
+
+    outputs: List[Any] = []
+    start = time.perf_counter()
+    for i in range(0, len(samples), args.batch_size):
+        outputs.extend(run(samples[i : i + args.batch_size]))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "profile": profile,
+        "load_s": load_s,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": statistics.quantiles(latencies, n=20)[-1] * 1000,
+        "throughput": len(samples) / elapsed,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_mb": _current_rss_mb(),
+        "weights_mb": _state_dict_mb(model),
+        "outputs": outputs,
+    }
+
+
+def _drift(task: str, reference: List[Any], outputs: List[Any]) -> str:
+    if task == "spam":
+        agree = sum(
+            r.index(max(r)) == o.index(max(o)) for r, o in zip(reference, outputs)
+        )
+        max_diff = max(
+            abs(a - b) for r, o in zip(reference, outputs) for a, b in zip(r, o)
+        )
+        return f"labels {agree}/{len(reference)}, max |Δp| {max_diff:.4f}"
+
+    exact = sum(r == o for r, o in zip(reference, outputs))
+    overlaps = []
+    for r, o in zip(reference, outputs):
+        ref_words, out_words = set(r.lower().split()), set(o.lower().split())
+        overlaps.append(len(ref_words & out_words) / max(len(ref_words | out_words), 1))
+    jaccard = statistics.mean(overlaps)
+    return f"exact {exact}/{len(reference)}, word Jaccard {jaccard:.3f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("task", choices=("spam", "summary"))
+    parser.add_argument("--profiles", nargs="+", default=["fp32", "int8"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads")
+    parser.add_argument("--interop-threads", type=int, default=0)
+    args = parser.parse_args()
+
+    # fp32 is always measured first as the drift reference
+    profiles = ["fp32"] + [p for p in args.profiles if p != "fp32"]
+    ctx = mp.get_context("spawn")
+    results = []
+    for profile in profiles:
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(_bench, (args.task, profile, args)))
+
+    reference = results[0]["outputs"]
+    print(
+        f"{'profile':<8} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'items/s':>8} {'peak MB':>8} {'RSS MB':>8} {'weights':>8}  drift vs fp32"
+    )
+    for r in results:
+        rss = f"{r['rss_mb']:>8.0f}" if r["rss_mb"] is not None else f"{'n/a':>8}"
+        print(
+            f"{r['profile']:<8} {r['load_s']:>7.2f} {r['p50_ms']:>8.1f} "
+            f"{r['p95_ms']:>8.1f} {r['throughput']:>8.2f} {r['peak_rss_mb']:>8.0f} "
+            f"{rss} {r['weights_mb']:>8.1f}  "
+            f"{_drift(args.task, reference, r['outputs'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""CPU inference profiles shared by the lab9 services.
+
+Environment variables:
+    INFERENCE_PROFILE       fp32 (default) or int8 - dynamic quantization of
+                            all ``nn.Linear`` layers, CPU only
+    TORCH_INTRA_OP_THREADS  threads used inside a single op (0 = torch default)
+    TORCH_INTER_OP_THREADS  threads running independent ops (0 = torch default)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional, Union
+
+import torch
+
+PROFILES = ("fp32", "int8")
+
+INFERENCE_PROFILE = os.getenv("INFERENCE_PROFILE", "fp32").lower()
+INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+INTER_OP_THREADS = int(os.getenv("TORCH_INTER_OP_THREADS", "0"))
+
+
+def configure_threads(
+    intra_op: Optional[int] = None, inter_op: Optional[int] = None
+) -> None:
+    """Apply torch thread counts; call before the first forward pass."""
+
+    intra_op = INTRA_OP_THREADS if intra_op is None else intra_op
+    inter_op = INTER_OP_THREADS if inter_op is None else inter_op
+
+    if intra_op > 0:
+        torch.set_num_threads(intra_op)
+    if inter_op > 0:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work started
+            current = torch.get_num_interop_threads()
+            print(f"⚠️ Inter-op threads already fixed at {current}")
+
+
+def apply_profile(
+    model: torch.nn.Module,
+    profile: Optional[str] = None,
+    device: Union[str, torch.device] = "cpu",
+) -> torch.nn.Module:
+    """Convert ``model`` to the requested inference profile and return it.
+
+    Quantization swaps the ``nn.Linear`` layers in place, so the fp32 weights
+    are freed instead of living next to an int8 copy.
+    """
+
+    profile = (profile or INFERENCE_PROFILE).lower()
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown INFERENCE_PROFILE {profile!r}, expected {PROFILES}")
+
+    if profile == "int8":
+        if torch.device(device).type != "cpu":
+            raise ValueError("int8 dynamic quantization is only supported on CPU")
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    return model
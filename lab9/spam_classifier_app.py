@@ -1,17 +1,45 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import Dict
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import torch
 import gradio as gr
+import uvicorn
+from fastapi import FastAPI, Response
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 
+from inference_profile import INFERENCE_PROFILE, apply_profile, configure_threads
+from metrics import BATCH_BUCKETS, CONTENT_TYPE, REGISTRY, TOKEN_BUCKETS
+
 # Konfiguracja
 MODEL_NAME = os.getenv(
     "HF_SPAM_MODEL", "mrm8488/bert-tiny-finetuned-enron-spam-detection"
 )
 MAX_LEN: int = int(os.getenv("EMAIL_MAX_LEN", "512"))
+# Mikro-batching: jak długo czekać na kolejne zapytania i ile ich zebrać
+BATCH_WINDOW_MS: float = float(os.getenv("BATCH_WINDOW_MS", "10"))
+MAX_BATCH_SIZE: int = int(os.getenv("MAX_BATCH_SIZE", "16"))
+# predict_many: rozmiar kubełka i liczba maili sortowanych razem wg długości
+BULK_BATCH_SIZE: int = int(os.getenv("BULK_BATCH_SIZE", "32"))
+BULK_SORT_WINDOW: int = int(os.getenv("BULK_SORT_WINDOW", "4096"))
 
 # Urządzenie-
 if torch.cuda.is_available() and bool(int(os.getenv("USE_CUDA", "0"))):
@@ -24,14 +52,31 @@ else:
 # Wyłącz równoległe tokenizery
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
+# Metryki (Prometheus, /metrics)
+STAGE_SECONDS = REGISTRY.histogram(
+    "spam_stage_seconds", "Time spent per inference stage", ("stage",)
+)
+INPUT_TOKENS = REGISTRY.histogram(
+    "spam_input_tokens", "Tokens per e-mail after truncation", buckets=TOKEN_BUCKETS
+)
+BATCH_ITEMS = REGISTRY.histogram(
+    "spam_batch_size", "E-mails per model forward pass", ("path",), BATCH_BUCKETS
+)
+QUEUE_DEPTH = REGISTRY.gauge("spam_queue_depth", "Requests waiting for the batcher")
+MODEL_LOAD_SECONDS = REGISTRY.gauge("spam_model_load_seconds", "Model load time")
+
 # Model i tokenizer
-print(f"🔄 Loading {MODEL_NAME} on {DEVICE}…")
+configure_threads()
+print(f"🔄 Loading {MODEL_NAME} on {DEVICE} ({INFERENCE_PROFILE})…")
+_load_start = time.perf_counter()
 _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
 _tokenizer.model_max_length = MAX_LEN
 
 _model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+_model = apply_profile(_model, device=DEVICE)
 _model.to(DEVICE)
 _model.eval()
+MODEL_LOAD_SECONDS.set(time.perf_counter() - _load_start)
 print("✅ Model loaded.")
 
 # Mapowanie id-etykieta
@@ -46,29 +91,186 @@ LABEL_HUMAN: Dict[str, str] = {
 
 # Predykcja
 
-def predict(email_text: str) -> Dict[str, float] | str:
-    email_text = email_text.strip()
-    if not email_text:
-        return "⚠️ Wklej treść e-maila."
-
-    enc = _tokenizer(
-        email_text,
-        truncation=True,
-        padding="max_length",
-        max_length=MAX_LEN,
-        return_tensors="pt",
-    ).to(DEVICE)
-
-    with torch.no_grad():
-        logits = _model(**enc).logits.squeeze(0)
-        probs = torch.softmax(logits, dim=-1).cpu().tolist()
-
+def _to_label_dict(probs: List[float]) -> Dict[str, float]:
     return {
         LABEL_HUMAN.get(id2label[idx], id2label[idx]): float(probs[idx])
         for idx in range(len(probs))
     }
 
 
+def _forward(enc: Any, path: str) -> List[Dict[str, float]]:
+    BATCH_ITEMS.observe(len(enc["input_ids"]), path=path)
+    with STAGE_SECONDS.time(stage="forward"), torch.no_grad():
+        logits = _model(**enc.to(DEVICE)).logits
+
+    with STAGE_SECONDS.time(stage="postprocess"):
+        probs = torch.softmax(logits, dim=-1).cpu().tolist()
+        return [_to_label_dict(row) for row in probs]
+
+
+def _predict_batch(texts: List[str]) -> List[Dict[str, float]]:
+    # Dopełnianie tylko do najdłuższego tekstu w batchu, nie do MAX_LEN
+    with STAGE_SECONDS.time(stage="tokenize"):
+        enc = _tokenizer(
+            texts,
+            truncation=True,
+            padding="longest",
+            max_length=MAX_LEN,
+            return_tensors="pt",
+        )
+    for length in enc["attention_mask"].sum(dim=1).tolist():
+        INPUT_TOKENS.observe(length)
+    return _forward(enc, path="online")
+
+
+class _MicroBatcher:
+    """Zbiera równoległe zapytania i przepuszcza je przez model jednym batchem.
+
+    Pierwsze zapytanie w kolejce otwiera okno ``window_s``; wszystko, co
+    przyjdzie w tym czasie (maks. ``max_batch`` sztuk), trafia do jednego
+    wywołania ``fn``. Każdy wywołujący dostaje własny wynik przez ``Future``.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[str]], List[Dict[str, float]]],
+        window_s: float,
+        max_batch: int,
+    ) -> None:
+        self._fn = fn
+        self._window_s = max(window_s, 0.0)
+        self._max_batch = max(max_batch, 1)
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="spam-batcher", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, text: str) -> Future:
+        fut: Future = Future()
+        self._queue.put((text, fut))
+        return fut
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._window_s
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                results = self._fn([text for text, _ in batch])
+            except Exception as exc:  # błąd modelu trafia do każdego czekającego
+                for _, fut in batch:
+                    fut.set_exception(exc)
+                continue
+            for (_, fut), result in zip(batch, results):
+                fut.set_result(result)
+
+
+_batcher = _MicroBatcher(_predict_batch, BATCH_WINDOW_MS / 1000.0, MAX_BATCH_SIZE)
+QUEUE_DEPTH.set_function(lambda: _batcher.depth)
+
+
+EMPTY_EMAIL_MSG = "⚠️ Wklej treść e-maila."
+
+
+def predict(email_text: str) -> Dict[str, float] | str:
+    email_text = email_text.strip()
+    if not email_text:
+        return EMPTY_EMAIL_MSG
+
+    return _batcher.submit(email_text).result()
+
+
+# Predykcja hurtowa (np. nocne skanowanie całych skrzynek)
+
+def _iter_jsonl(path: Union[str, os.PathLike], text_key: str) -> Iterator[str]:
+    # Linia to albo sam string JSON, albo obiekt z polem ``text_key``
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            yield record if isinstance(record, str) else record[text_key]
+
+
+def _predict_window(
+    texts: List[str], batch_size: int
+) -> List[Dict[str, float] | str]:
+    results: List[Optional[Dict[str, float] | str]] = [None] * len(texts)
+    positions: List[int] = []
+    cleaned: List[str] = []
+    for pos, text in enumerate(texts):
+        text = text.strip()
+        if text:
+            positions.append(pos)
+            cleaned.append(text)
+        else:
+            results[pos] = EMPTY_EMAIL_MSG
+
+    if cleaned:
+        # Tokenizacja raz, bez dopełniania - długości służą do sortowania
+        with STAGE_SECONDS.time(stage="tokenize"):
+            enc = _tokenizer(cleaned, truncation=True, max_length=MAX_LEN)
+        lengths = [len(ids) for ids in enc["input_ids"]]
+        for length in lengths:
+            INPUT_TOKENS.observe(length)
+
+        order = sorted(range(len(cleaned)), key=lengths.__getitem__)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start : start + batch_size]
+            features = {key: [enc[key][j] for j in bucket] for key in enc.keys()}
+            with STAGE_SECONDS.time(stage="tokenize"):
+                padded = _tokenizer.pad(
+                    features, padding="longest", return_tensors="pt"
+                )
+            for j, result in zip(bucket, _forward(padded, path="bulk")):
+                results[positions[j]] = result
+
+    return results  # type: ignore[return-value]
+
+
+def predict_many(
+    emails: Union[Iterable[str], str, os.PathLike],
+    batch_size: int = BULK_BATCH_SIZE,
+    sort_window: int = BULK_SORT_WINDOW,
+    text_key: str = "text",
+) -> Iterator[Dict[str, float] | str]:
+    """Klasyfikuje wiele maili, zwracając wyniki strumieniowo w kolejności wejścia.
+
+    ``emails`` to iterowalna kolekcja tekstów albo ścieżka do pliku JSONL.
+    Wejście czytane jest oknami po ``sort_window`` maili; w każdym oknie
+    maile są sortowane wg liczby tokenów i dzielone na kubełki po
+    ``batch_size``, dopełniane tylko do najdłuższego elementu kubełka.
+    """
+
+    if isinstance(emails, (str, os.PathLike)):
+        emails = _iter_jsonl(emails, text_key)
+
+    it = iter(emails)
+    while True:
+        window = list(islice(it, max(sort_window, 1)))
+        if not window:
+            return
+        yield from _predict_window(window, max(batch_size, 1))
+
+
 # Interfejs Gradio
 
 demo = gr.Interface(
@@ -83,7 +285,33 @@ demo = gr.Interface(
     ],
     allow_flagging="never",
     theme="default",
+    # Gradio domyślnie obsługuje jedno wywołanie naraz - bez tego batcher
+    # nigdy nie zobaczyłby równoległych zapytań
+    concurrency_limit=MAX_BATCH_SIZE,
 )
 
+
+def create_app() -> FastAPI:
+    """Interfejs Gradio pod ``/`` oraz metryki Prometheusa pod ``/metrics``."""
+
+    app = FastAPI()
+
+    @app.get("/metrics")
+    def metrics() -> Response:
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    return gr.mount_gradio_app(app, demo, path="/")
+
+
 if __name__ == "__main__":
-    demo.launch()
+    # python spam_classifier_app.py maile.jsonl  -> wyniki jako JSONL na stdout
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            for result in predict_many(path):
+                print(json.dumps(result, ensure_ascii=False))
+    else:
+        uvicorn.run(
+            create_app(),
+            host=os.getenv("GRADIO_SERVER_NAME", "127.0.0.1"),
+            port=int(os.getenv("GRADIO_SERVER_PORT", "7860")),
+        )
@@ -1,16 +1,64 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 import torch
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+from transformers import (
+    AutoModelForSeq2SeqLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextStreamer,
+    pipeline,
+)
+
+from inference_profile import INFERENCE_PROFILE, apply_profile, configure_threads
+from metrics import BATCH_BUCKETS, CONTENT_TYPE, REGISTRY, TOKEN_BUCKETS
 
 # Configuration
 MODEL_NAME = os.getenv("HF_SUMMARY_MODEL", "facebook/bart-large-cnn")
 DEVICE = 0 if torch.cuda.is_available() else -1  # GPU if available
+CHUNK_OVERLAP = int(os.getenv("SUMMARY_CHUNK_OVERLAP", "64"))  # tokens
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "8"))  # texts per generate
+BATCH_WINDOW_MS = float(os.getenv("SUMMARY_BATCH_WINDOW_MS", "20"))
+MAX_REDUCE_ROUNDS = int(os.getenv("SUMMARY_MAX_REDUCE_ROUNDS", "4"))
+STREAM_TOKEN_TIMEOUT = float(os.getenv("SUMMARY_STREAM_TIMEOUT", "60"))  # seconds
+CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))  # entries in memory
+CACHE_DB = os.getenv("SUMMARY_CACHE_DB", "")  # SQLite file; empty = memory only
+
+# Metrics (Prometheus text format at /metrics)
+STAGE_SECONDS = REGISTRY.histogram(
+    "summarizer_stage_seconds", "Time spent per inference stage", ("stage",)
+)
+INPUT_TOKENS = REGISTRY.histogram(
+    "summarizer_input_tokens",
+    "Tokens per input text after truncation",
+    buckets=TOKEN_BUCKETS,
+)
+OUTPUT_TOKENS = REGISTRY.histogram(
+    "summarizer_output_tokens", "Tokens per generated summary", buckets=TOKEN_BUCKETS
+)
+BATCH_ITEMS = REGISTRY.histogram(
+    "summarizer_batch_size", "Texts per generate call", buckets=BATCH_BUCKETS
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "summarizer_queue_depth", "Requests waiting for the inference worker"
+)
+MODEL_LOAD_SECONDS = REGISTRY.gauge("summarizer_model_load_seconds", "Model load time")
 
 # FastAPI application instance
 app = FastAPI(
@@ -21,13 +69,21 @@ app = FastAPI(
 
 
 # Pydantic schemas
-class SummarizeRequest(BaseModel):
-    """Input payload for /summarize."""
+class GenerationOptions(BaseModel):
+    """Decoding parameters shared by all summarization endpoints."""
 
-    text: str = Field(..., description="Raw text to summarize")
     max_length: int = Field(200, ge=10, le=512)
     min_length: int = Field(30, ge=5, le=256)
     do_sample: bool = Field(False, description="Sampling vs greedy decoding")
+    use_cache: bool = Field(
+        True, description="Reuse/store cached summaries (disable for fresh samples)"
+    )
+
+
+class SummarizeRequest(GenerationOptions):
+    """Input payload for /summarize."""
+
+    text: str = Field(..., description="Raw text to summarize")
 
 
 class SummarizeResponse(BaseModel):
@@ -36,36 +92,599 @@ class SummarizeResponse(BaseModel):
     summary: str
 
 
+class SummarizeBatchRequest(GenerationOptions):
+    """Input payload for /summarize/batch."""
+
+    texts: List[str] = Field(..., description="Raw texts to summarize")
+
+
+class SummarizeBatchResponse(BaseModel):
+    """Summaries in the same order as the submitted texts."""
+
+    summaries: List[str]
+
+
+class LongSummarizeRequest(SummarizeRequest):
+    """Input payload for /summarize/long."""
+
+    chunk_overlap: int = Field(
+        CHUNK_OVERLAP, ge=0, le=256, description="Tokens shared by adjacent chunks"
+    )
+
+
+class LongSummarizeResponse(SummarizeResponse):
+    """Map-reduce summary with chunking statistics."""
+
+    chunks: int = Field(..., description="Number of input chunks (map stage)")
+    rounds: int = Field(..., description="Summarization passes, including map")
+    timings: Dict[str, float] = Field(..., description="Seconds spent per stage")
+    truncated: bool = Field(
+        False, description="Part of the text did not fit and was left out"
+    )
+
+
+# Requests sharing a key can be served by a single generate call
+GenerationKey = Tuple[int, int, bool]
+
+
+def _generation_key(opts: GenerationOptions) -> GenerationKey:
+    return (opts.max_length, opts.min_length, opts.do_sample)
+
+
+def _summarize_many(
+    texts: List[str], max_length: int, min_length: int, do_sample: bool
+) -> List[str]:
+    """Run one batched generate call; blocks, so never call it on the loop.
+
+    Mirrors what the summarization pipeline does, split into stages so each
+    one can be timed separately.
+    """
+
+    tokenizer, model = summarizer.tokenizer, summarizer.model
+    prefix = model.config.prefix or ""
+    BATCH_ITEMS.observe(len(texts))
+
+    with STAGE_SECONDS.time(stage="tokenize"):
+        enc = tokenizer(
+            [prefix + text for text in texts],
+            truncation=True,
+            padding=True,
+            return_tensors="pt",
+        ).to(model.device)
+    for length in enc["attention_mask"].sum(dim=1).tolist():
+        INPUT_TOKENS.observe(length)
+
+    with STAGE_SECONDS.time(stage="generate"), torch.no_grad():
+        output_ids = model.generate(
+            **enc, max_length=max_length, min_length=min_length, do_sample=do_sample
+        )
+    pad_id = tokenizer.pad_token_id
+    for length in (output_ids != pad_id).sum(dim=1).tolist():
+        OUTPUT_TOKENS.observe(length)
+
+    with STAGE_SECONDS.time(stage="decode"):
+        return tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+
+
+# Summary cache
+class SummaryCache:
+    """Bounded in-memory LRU with an optional SQLite tier that survives restarts.
+
+    Thread-safe; memory hits are promoted to most-recent, disk hits are
+    copied back into memory.
+    """
+
+    def __init__(self, capacity: int, db_path: str = "") -> None:
+        self._capacity = max(capacity, 0)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries "
+                "(key TEXT PRIMARY KEY, summary TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text: str, opts: GenerationOptions) -> str:
+        # Whitespace and Unicode form differences should not defeat the cache
+        normalized = " ".join(unicodedata.normalize("NFC", text).split())
+        payload = json.dumps(
+            [MODEL_NAME, INFERENCE_PROFILE, *_generation_key(opts), normalized],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return summary
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT summary FROM summaries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._remember(key, summary)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)",
+                    (key, summary),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, summary: str) -> None:
+        if self._capacity == 0:
+            return
+        self._entries[key] = summary
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "capacity": self._capacity,
+                "persistent": self._db is not None,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+cache = SummaryCache(CACHE_SIZE, CACHE_DB)
+
+
+# Background inference worker
+class _InferenceWorker:
+    """Single consumer of an asyncio queue that owns all model calls.
+
+    Requests arriving within ``window_s`` of each other (up to ``max_batch``)
+    are grouped by their :data:`GenerationKey` and each group is summarized
+    with one ``generate`` call on a dedicated thread, so the event loop stays
+    responsive while the model is busy.
+    """
+
+    def __init__(self, window_s: float, max_batch: int) -> None:
+        self._window_s = max(window_s, 0.0)
+        self._max_batch = max(max_batch, 1)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="summarizer"
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    def run_exclusive(self, fn: Callable, *args) -> asyncio.Future:
+        """Run ``fn`` on the model thread, between batched generate calls."""
+
+        return asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def submit(self, text: str, key: GenerationKey) -> str:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, key, fut))
+        return await fut
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._window_s
+        while len(batch) < self._max_batch:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            groups: Dict[GenerationKey, list] = {}
+            for text, key, fut in await self._collect():
+                # Skip requests whose client has already gone away
+                if not fut.done():
+                    groups.setdefault(key, []).append((text, fut))
+
+            for key, items in groups.items():
+                try:
+                    summaries = await loop.run_in_executor(
+                        self._executor,
+                        _summarize_many,
+                        [text for text, _ in items],
+                        *key,
+                    )
+                except Exception as exc:
+                    for _, fut in items:
+                        if not fut.done():
+                            fut.set_exception(exc)
+                    continue
+                for (_, fut), summary in zip(items, summaries):
+                    if not fut.done():
+                        fut.set_result(summary)
+
+
 # Model loading (startup hook)
 @app.on_event("startup")
 def _load_model() -> None:
     """Initialise HF pipeline once at startup."""
 
+    configure_threads()
+    start = time.perf_counter()
     tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
     model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+    model = apply_profile(model, device="cpu" if DEVICE < 0 else f"cuda:{DEVICE}")
 
-    # Global for reuse across requests (thread‑safe in FastAPI workers)
+    # Global for reuse across requests; only the inference worker calls it
     global summarizer
     summarizer = pipeline(
         "summarization", model=model, tokenizer=tokenizer, device=DEVICE
     )
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
+
+
+@app.on_event("startup")
+async def _start_worker() -> None:
+    """Start the inference worker on the server's event loop."""
+
+    global worker
+    worker = _InferenceWorker(BATCH_WINDOW_MS / 1000.0, SUMMARY_BATCH_SIZE)
+    worker.start()
+    QUEUE_DEPTH.set_function(lambda: worker.depth)
+
+
+@app.on_event("shutdown")
+async def _stop_worker() -> None:
+    await worker.stop()
+    cache.close()
+
+
+async def _summarize_one(text: str, opts: GenerationOptions) -> str:
+    """Summarize ``text`` via the cache, falling back to the inference worker."""
+
+    if not opts.use_cache:
+        return await worker.submit(text, _generation_key(opts))
+
+    key = SummaryCache.make_key(text, opts)
+    # The disk tier does blocking I/O, so keep lookups off the event loop
+    summary = await run_in_threadpool(cache.get, key)
+    if summary is None:
+        summary = await worker.submit(text, _generation_key(opts))
+        await run_in_threadpool(cache.put, key, summary)
+    return summary
+
+
+# Endpoints
+@app.get("/health", tags=["meta"])
+async def health() -> Dict[str, object]:
+    """Liveness probe; answered by the event loop even while generating."""
+
+    return {"status": "ok", "queue_depth": worker.depth}
+
+
+@app.get("/metrics", tags=["meta"])
+async def metrics() -> Response:
+    """Stage latencies, token counts, batch sizes and queue depth."""
+
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@app.get("/cache/stats", tags=["meta"])
+async def cache_stats() -> Dict[str, object]:
+    """Summary cache hit/miss counters."""
+
+    return cache.stats()
 
 
-# Endpoint
 @app.post("/summarize", response_model=SummarizeResponse, tags=["summarization"])
-def summarize(req: SummarizeRequest) -> SummarizeResponse:
+async def summarize(req: SummarizeRequest) -> SummarizeResponse:
+
+    text = req.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="'text' field cannot be empty")
+
+    # Cache first, then the batching worker; _summarize_many truncates the input
+    result = await _summarize_one(text, req)
+
+    return SummarizeResponse(summary=result)
+
+
+@app.post(
+    "/summarize/batch", response_model=SummarizeBatchResponse, tags=["summarization"]
+)
+async def summarize_batch(req: SummarizeBatchRequest) -> SummarizeBatchResponse:
+    """Summarize many texts at once with shared decoding parameters."""
+
+    texts = [text.strip() for text in req.texts]
+    if not texts:
+        raise HTTPException(status_code=400, detail="'texts' field cannot be empty")
+    if not all(texts):
+        raise HTTPException(
+            status_code=400, detail="'texts' cannot contain empty items"
+        )
+
+    # Each text is queued separately so it can share a batch with other requests
+    summaries = await asyncio.gather(*(_summarize_one(text, req) for text in texts))
+
+    return SummarizeBatchResponse(summaries=list(summaries))
+
+
+# Long-document (map-reduce) summarization
+def _input_window() -> int:
+    """Usable tokens per model call, excluding special tokens."""
+
+    tokenizer = summarizer.tokenizer
+    limit = min(
+        tokenizer.model_max_length, summarizer.model.config.max_position_embeddings
+    )
+    return limit - tokenizer.num_special_tokens_to_add()
+
+
+def _chunk_text(text: str, window: int, overlap: int) -> List[str]:
+    """Split ``text`` into overlapping chunks of at most ``window`` tokens."""
+
+    tokenizer = summarizer.tokenizer
+    ids = tokenizer(text, add_special_tokens=False, truncation=False)["input_ids"]
+    if len(ids) <= window:
+        return [text]
+
+    step = max(window - overlap, 1)
+    chunks = []
+    for start in range(0, len(ids), step):
+        chunks.append(
+            tokenizer.decode(ids[start : start + window], skip_special_tokens=True)
+        )
+        if start + window >= len(ids):
+            break
+    return chunks
+
+
+def _pack_windows(texts: List[str], window: int) -> Tuple[List[str], bool]:
+    """Join consecutive whole ``texts`` into as few ``window``-token inputs as fit.
+
+    Returns the packed inputs and whether any single text alone exceeds the
+    window (the model then truncates it).
+    """
+
+    tokenizer = summarizer.tokenizer
+    # Counted with the joining space, as the text appears inside a pack
+    ids = tokenizer([" " + t for t in texts], add_special_tokens=False)["input_ids"]
+    packs: List[str] = []
+    current: List[str] = []
+    used = 0
+    for text, size in zip(texts, map(len, ids)):
+        if current and used + size > window:
+            packs.append(" ".join(current))
+            current, used = [], 0
+        current.append(text)
+        used += size
+    packs.append(" ".join(current))
+    return packs, any(len(i) > window for i in ids)
+
+
+@app.post(
+    "/summarize/long", response_model=LongSummarizeResponse, tags=["summarization"]
+)
+async def summarize_long(req: LongSummarizeRequest) -> LongSummarizeResponse:
+    """Summarize text longer than the model context via map-reduce.
+
+    The text is split into overlapping token windows which are summarized
+    as a batch (map); whole partial summaries are then packed into windows
+    and summarized again (reduce) until one summary is left. Intermediate
+    summaries are capped at half a window, so every pack holds at least two
+    of them and each round roughly halves their number. If the text still
+    cannot be covered, ``truncated`` is set in the response.
+    """
 
     text = req.text.strip()
     if not text:
         raise HTTPException(status_code=400, detail="'text' field cannot be empty")
 
-    # Hugging Face pipeline handles tokenization/truncation internally
-    result = summarizer(
-        text,
-        max_length=req.max_length,
-        min_length=req.min_length,
+    window = _input_window()
+    timings: Dict[str, float] = {}
+
+    # Options for summaries that are reduced again; the final pass uses req
+    partial_length = min(req.max_length, window // 2)
+    partial_opts = GenerationOptions(
+        max_length=partial_length,
+        min_length=min(req.min_length, partial_length),
         do_sample=req.do_sample,
-        truncation=True,
-    )[0]["summary_text"]
+        use_cache=req.use_cache,
+    )
+
+    # Chunk summaries are cached individually, so re-submitted or edited
+    # reports only pay for the chunks that changed
+    async def summarize_all(texts: List[str]) -> List[str]:
+        opts = req if len(texts) == 1 else partial_opts
+        return list(await asyncio.gather(*(_summarize_one(t, opts) for t in texts)))
+
+    start = time.perf_counter()
+    overlap = min(req.chunk_overlap, window // 2)
+    chunks = await run_in_threadpool(_chunk_text, text, window, overlap)
+    timings["chunking"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    partials = await summarize_all(chunks)
+    timings["map"] = time.perf_counter() - start
+    rounds = 1
+    truncated = False
+
+    start = time.perf_counter()
+    while len(partials) > 1:
+        packs, too_long = await run_in_threadpool(_pack_windows, partials, window)
+        truncated = truncated or too_long
+        # Another round would not shrink the input - keep what fits in one window
+        if len(packs) >= len(partials) or rounds > MAX_REDUCE_ROUNDS:
+            packs, truncated = packs[:1], True
+        partials = await summarize_all(packs)
+        rounds += 1
+    timings["reduce"] = time.perf_counter() - start
+    timings["total"] = sum(timings.values())
+
+    return LongSummarizeResponse(
+        summary=partials[0],
+        chunks=len(chunks),
+        rounds=rounds,
+        timings=timings,
+        truncated=truncated,
+    )
+
+
+# Streaming (server-sent events)
+class _StopOnEvent(StoppingCriteria):
+    """Abort generation once the client has disconnected."""
+
+    def __init__(self, event: threading.Event) -> None:
+        self._event = event
+
+    def __call__(self, input_ids: torch.LongTensor, scores, **kwargs) -> torch.Tensor:
+        return torch.full(
+            (input_ids.shape[0],),
+            self._event.is_set(),
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+
+class _QueueStreamer(TextStreamer):
+    """Hand decoded text to an ``asyncio.Queue`` read on the event loop.
 
-    return SummarizeResponse(summary=result)
\ No newline at end of file
+    ``generate`` runs on the inference worker thread, so every piece is
+    passed over with ``call_soon_threadsafe``; ``None`` marks the end. Unlike
+    ``TextIteratorStreamer`` no thread has to block waiting for the next token.
+    """
+
+    def __init__(self, tokenizer, loop: asyncio.AbstractEventLoop, **decode_kwargs):
+        super().__init__(tokenizer, skip_prompt=True, **decode_kwargs)
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self._loop = loop
+
+    def on_finalized_text(self, text: str, stream_end: bool = False) -> None:
+        self._loop.call_soon_threadsafe(self.queue.put_nowait, text)
+        if stream_end:
+            self._loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+
+def _generate_streaming(
+    text: str,
+    opts: GenerationOptions,
+    streamer: _QueueStreamer,
+    stop: threading.Event,
+) -> None:
+    tokenizer, model = summarizer.tokenizer, summarizer.model
+    try:
+        with STAGE_SECONDS.time(stage="tokenize"):
+            prefix = model.config.prefix or ""
+            enc = tokenizer(prefix + text, truncation=True, return_tensors="pt")
+        enc = enc.to(model.device)
+        INPUT_TOKENS.observe(enc["input_ids"].shape[1])
+        with STAGE_SECONDS.time(stage="generate_stream"), torch.no_grad():
+            model.generate(
+                **enc,
+                max_length=opts.max_length,
+                min_length=opts.min_length,
+                do_sample=opts.do_sample,
+                num_beams=1,  # streamers do not support beam search
+                streamer=streamer,
+                stopping_criteria=StoppingCriteriaList([_StopOnEvent(stop)]),
+            )
+    except Exception:
+        streamer.end()  # unblock the consumer; the error surfaces via the future
+        raise
+
+
+def _sse(data: Dict[str, object], event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/summarize/stream", tags=["summarization"])
+async def summarize_stream(req: SummarizeRequest) -> StreamingResponse:
+    """Stream the summary as server-sent events while it is generated.
+
+    Emits ``data: {"token": ...}`` events followed by a final ``done`` event
+    carrying the full summary. Decoding is greedy or sampled (no beam search),
+    so the text can differ from ``/summarize``.
+    """
+
+    text = req.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="'text' field cannot be empty")
+
+    streamer = _QueueStreamer(
+        summarizer.tokenizer, asyncio.get_running_loop(), skip_special_tokens=True
+    )
+    stop = threading.Event()
+    generation = worker.run_exclusive(_generate_streaming, text, req, streamer, stop)
+
+    async def events() -> AsyncIterator[str]:
+        pieces: List[str] = []
+        try:
+            while True:
+                piece = await asyncio.wait_for(
+                    streamer.queue.get(), STREAM_TOKEN_TIMEOUT
+                )
+                if piece is None:
+                    break
+                if piece:
+                    pieces.append(piece)
+                    yield _sse({"token": piece})
+            await generation
+            yield _sse({"summary": "".join(pieces).strip()}, event="done")
+        except Exception as exc:
+            yield _sse({"detail": str(exc)}, event="error")
+        finally:
+            stop.set()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )